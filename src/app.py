@@ -6,22 +6,36 @@ Provides RESTful endpoints for job scraping with comprehensive error handling,
 logging, and configuration management.
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request, stream_with_context
 from flask_cors import CORS
 from loguru import logger
 import yaml
+import json
 import os
 import traceback
+import threading
 from datetime import datetime
 import time
+from cache import ResponseCache
+from scrape_queue import QueueFullError, ScrapeQueue
+from metrics import REGISTRY, StageTimings
+from formatters import accepted_encodings, compress, parse_fields, parse_format, project, telegram_batches
 
 # Initialize Flask app
 app = Flask(__name__)
+# Send non-ASCII text (Polish titles, emoji) as UTF-8 rather than \u escapes
+app.json.ensure_ascii = False
 
 # Load configuration
 def load_config():
-    config_path = os.path.join(os.path.dirname(__file__), 'config', 'config.yaml')
-    if not os.path.exists(config_path):
+    # Next to the code in the Docker image, one level up in a checkout (same as the scraper)
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    candidates = [
+        os.path.join(base_dir, 'config', 'config.yaml'),
+        os.path.join(base_dir, os.pardir, 'config', 'config.yaml')
+    ]
+    config_path = next((path for path in candidates if os.path.exists(path)), None)
+    if config_path is None:
         # Fallback to default config
         return {
             'api': {'host': '0.0.0.0', 'port': 5000, 'debug': False, 'cors_origins': ['*']},
@@ -46,15 +60,40 @@ logger.add(
     level=config.get('logging', {}).get('level', 'INFO')
 )
 
+# Cache of scrape results shared by all /jobs callers
+db_config = config.get('database', {})
+response_cache = ResponseCache(
+    ttl=db_config.get('cache_duration', 3600),
+    max_entries=db_config.get('cache_max_entries', 64),
+    stale_ttl=db_config.get('cache_stale_duration', 600),
+    enabled=db_config.get('enable_caching', True)
+)
+
+def parse_bool(value, default=False):
+    """Interpret a query-string or JSON flag such as 1/true/yes"""
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ('1', 'true', 'yes', 'on')
+
+def cache_key(keywords, sources):
+    """Normalize search parameters so equivalent requests share a cache entry"""
+    normalized_keywords = tuple(sorted({' '.join(k.lower().split()) for k in keywords if k.strip()}))
+    normalized_sources = tuple(sorted({s.strip().lower() for s in sources if s.strip()}))
+    return (normalized_keywords, normalized_sources)
+
 # Import scraper (with fallback for missing modules)
 try:
-    from scraper import scrape_jobs
+    from scraper import iter_jobs, scrape_jobs, warm_driver_pool
+    from driver_pool import get_driver_pool
+    from job_store import get_job_store
     scraper_available = True
 except ImportError:
     logger.warning("Scraper module not available - using mock data")
     scraper_available = False
     
-    def scrape_jobs():
+    def scrape_jobs(keywords=None, sources=None, incremental=False, progress=None, timings=None, resume=True, outcome=None):
         """Mock scraper function for testing"""
         return [
             {
@@ -68,6 +107,208 @@ except ImportError:
                 "extracted": datetime.now().isoformat()
             }
         ]
+    
+    def iter_jobs(keywords=None, sources=None, incremental=False, progress=None, resume=True):
+        """Mock streaming scraper for testing"""
+        yield from scrape_jobs(keywords, sources, incremental, progress)
+    
+    def get_job_store(config=None):
+        """No job store (and so no delta feed) without the scraper"""
+        return None
+
+def parse_cursor(value):
+    """Parse a delta feed cursor (a change log sequence number); None when absent"""
+    if value is None or value == '':
+        return None
+    cursor = int(value)
+    if cursor < 0:
+        raise ValueError(f"Invalid cursor: {value}")
+    return cursor
+
+def parse_search_params(args):
+    """Read search parameters from a query string or JSON body"""
+    search_config = config.get('search', {})
+    enabled_sources = [name for name, v in config.get('sources', {}).items() if v.get('enabled')] or ['pracuj']
+    sources = args.get('sources') or enabled_sources
+    if isinstance(sources, str):
+        sources = sources.split(',')
+    
+    # Several comma-separated queries are scraped in parallel; none means all default queries
+    keywords = args.get('keywords') or search_config.get('default_keywords', ['python engineer'])
+    if isinstance(keywords, str):
+        keywords = keywords.split(',')
+    
+    return {
+        'keywords': [k.strip() for k in keywords if k.strip()],
+        'max_results': int(args.get('max_results', search_config.get('max_results_per_source', 100))),
+        'sources': sorted({s.strip().lower() for s in sources if s.strip()}),
+        'incremental': parse_bool(args.get('incremental')),
+        'refresh': parse_bool(args.get('refresh')),
+        'timings': parse_bool(args.get('timings')),
+        'since': parse_cursor(args.get('since'))
+    }
+
+def run_search(params, progress=None, timings=None):
+    """Run a search through the result cache and return (jobs, cache_info, cursor, partial)
+    
+    `cursor` is the delta feed position to poll from next, or None without a job store.
+    `partial` is True when some searches failed or stopped early; such results are
+    returned but never cached.
+    """
+    key = cache_key(params['keywords'], params['sources'])
+    store = get_job_store(config)
+    
+    def scrape():
+        # Offers logged after this point are either in the result or left for the next poll,
+        # so the cursor is cached together with the jobs it belongs to
+        cursor = store.cursor() if store is not None else None
+        outcome = {}
+        jobs = scrape_jobs(
+            params['keywords'],
+            sources=params['sources'],
+            incremental=params['incremental'],
+            progress=progress,
+            timings=timings,
+            # A forced refresh starts over instead of continuing a failed run's checkpoint
+            resume=not params['refresh'],
+            outcome=outcome
+        )
+        return jobs, cursor, outcome.get('partial', False)
+    
+    # Incremental, forced and delta requests always go to the source; a cached result would
+    # miss offers that other searches have logged since it was computed
+    if params['incremental'] or params['refresh'] or params.get('since') is not None:
+        (results, cursor, partial), cache_info = scrape(), {'status': 'bypass', 'age': 0}
+    else:
+        (results, cursor, partial), cache_info = response_cache.get_or_compute(
+            key, scrape, cacheable=lambda value: not value[2])
+    
+    if params.get('since') is not None:
+        results, cursor = new_jobs_since(results, params['since'], params['max_results'], cursor)
+    
+    # Apply max_results limit
+    return results[:params['max_results']], cache_info, cursor, partial
+
+def new_jobs_since(jobs, since, limit, cursor):
+    """Keep jobs first discovered after `since`, leaving out reposts of older offers
+    
+    Returns (jobs, next_cursor). When more than `limit` offers are new, the earliest
+    discovered ones are delivered and the cursor stops at the last of them, so the rest
+    follow on the next poll.
+    """
+    store = get_job_store(config)
+    seqs = store.new_since(since, [job['id'] for job in jobs if job.get('id')])
+    new_jobs = [job for job in jobs if job.get('id') in seqs and not job.get('duplicate_of')]
+    
+    if len(new_jobs) > limit:
+        delivered = {job['id'] for job in sorted(new_jobs, key=lambda job: seqs[job['id']])[:limit]}
+        new_jobs = [job for job in new_jobs if job['id'] in delivered]
+        return new_jobs, max(seqs[job_id] for job_id in delivered)
+    
+    # The cursor never moves backwards, even for a client polling with a newer one
+    return new_jobs, max([since, cursor or 0] + [seqs[job['id']] for job in new_jobs])
+
+def stream_search(params, fields=None):
+    """Stream jobs as newline-delimited JSON while they are scraped (or from a fresh cache entry)"""
+    cached = None
+    if not (params['incremental'] or params['refresh']):
+        cached = response_cache.peek(cache_key(params['keywords'], params['sources']))
+    
+    if cached:
+        jobs, cache_info = iter(cached[0][0]), cached[1]
+    else:
+        jobs = iter_jobs(
+            params['keywords'],
+            sources=params['sources'],
+            incremental=params['incremental'],
+            resume=not params['refresh']
+        )
+        cache_info = {'status': 'bypass', 'age': 0}
+    
+    def generate():
+        start_time = time.time()
+        count = 0
+        try:
+            for job in jobs:
+                if count >= params['max_results']:
+                    break
+                count += 1
+                yield json.dumps(project([job], fields)[0], ensure_ascii=False) + '\n'
+        finally:
+            # Stops the scrape early when max_results is reached or the client disconnects
+            if hasattr(jobs, 'close'):
+                jobs.close()
+            logger.info(f"Streamed {count} jobs in {time.time() - start_time:.2f}s (cache: {cache_info['status']})")
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'X-Cache': cache_info['status'], 'Cache-Control': 'no-cache'}
+    )
+
+# Background scrapes submitted through POST /scrapes
+queue_config = config.get('scrape_queue', {})
+def run_background_search(params, progress):
+    """Scrape queue runner: returns (jobs, partial, cursor)"""
+    results, _, cursor, partial = run_search(params, progress)
+    return results, partial, cursor
+
+scrape_queue = ScrapeQueue(
+    run_background_search,
+    workers=queue_config.get('workers', 2),
+    max_queued=queue_config.get('max_queued', 20),
+    result_ttl=queue_config.get('result_ttl', 3600)
+)
+
+# HTTP request metrics
+REQUEST_SECONDS = REGISTRY.histogram(
+    'job_scraper_http_request_seconds', 'API request latency', ('endpoint', 'method', 'status'))
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    start = g.get('request_start')
+    if start is not None:
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_SECONDS.observe(time.perf_counter() - start, endpoint=endpoint,
+                                method=request.method, status=response.status_code)
+    return response
+
+# Response compression for JSON and text bodies
+compression_config = config.get('api', {}).get('compression', {})
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/plain')
+
+@app.after_request
+def compress_response(response):
+    """Compress buffered responses with the best coding the client accepts (br or gzip)"""
+    if not compression_config.get('enabled', True):
+        return response
+    # Streams stay uncompressed so every line reaches the client as soon as it is scraped
+    if response.is_streamed or response.direct_passthrough or 'Content-Encoding' in response.headers:
+        return response
+    if response.status_code < 200 or response.status_code >= 300 or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    encoding = request.accept_encodings.best_match(accepted_encodings())
+    data = response.get_data()
+    if not encoding or len(data) < compression_config.get('min_size', 1024):
+        return response
+    
+    response.set_data(compress(data, encoding, compression_config.get('level', 6)))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+def start_background_services():
+    """Start scrape workers and warm the driver pool outside the request path"""
+    scrape_queue.start()
+    
+    # Start Chrome instances in the background so the first request skips the cold start
+    if scraper_available:
+        threading.Thread(target=warm_driver_pool, args=(config,), daemon=True).start()
 
 @app.route('/health')
 def health_check():
@@ -79,10 +320,15 @@ def health_check():
             'version': '2.0',
             'components': {
                 'scraper': 'available' if scraper_available else 'mock',
-                'config': 'loaded'
+                'config': 'loaded',
+                'cache': response_cache.stats(),
+                'scrape_queue': scrape_queue.stats()
             }
         }
         
+        if scraper_available:
+            health_status['components']['driver_pool'] = get_driver_pool(config).stats()
+        
         return jsonify(health_status), 200
         
     except Exception as e:
@@ -100,32 +346,81 @@ def get_jobs():
     
     try:
         # Parse query parameters
-        keywords = request.args.get('keywords', config.get('search', {}).get('default_keywords', ['python engineer'])[0])
-        max_results = int(request.args.get('max_results', config.get('search', {}).get('max_results_per_source', 100)))
+        params = parse_search_params(request.args)
+        fields = parse_fields(request.args.get('fields'))
+        output_format = parse_format(request.args.get('format'))
         
-        logger.info(f"Starting job scraping - Keywords: {keywords}, Max results: {max_results}")
+        logger.info(f"Starting job scraping - Keywords: {params['keywords']}, Max results: {params['max_results']}")
         
-        # Scrape jobs
-        results = scrape_jobs()
+        store = get_job_store(config)
+        if params['since'] is not None and store is None:
+            return jsonify({
+                'success': False,
+                'error': 'The since cursor requires the job store (database.type: sqlite)',
+                'timestamp': datetime.now().isoformat()
+            }), 400
         
-        # Apply max_results limit
-        if len(results) > max_results:
-            results = results[:max_results]
+        if parse_bool(request.args.get('stream')):
+            if params['since'] is not None:
+                return jsonify({
+                    'success': False,
+                    'error': 'The since cursor is not supported with stream',
+                    'timestamp': datetime.now().isoformat()
+                }), 400
+            if output_format != 'json':
+                return jsonify({
+                    'success': False,
+                    'error': f"format={output_format} is not supported with stream",
+                    'timestamp': datetime.now().isoformat()
+                }), 400
+            return stream_search(params, fields)
+        
+        timings = StageTimings() if params['timings'] else None
+        results, cache_info, cursor, partial = run_search(params, timings=timings)
         
         processing_time = time.time() - start_time
         
         response = {
             'success': True,
-            'jobs': results,
             'total_count': len(results),
+            'partial': partial,
             'processing_time': round(processing_time, 2),
+            'cache': cache_info,
             'timestamp': datetime.now().isoformat(),
             'version': '2.0'
         }
         
-        logger.info(f"Scraping completed successfully. Found {len(results)} jobs in {processing_time:.2f}s")
+        # Telegram mode sends ready-to-post message batches instead of job dicts
+        if output_format == 'telegram':
+            n8n_config = config.get('n8n', {})
+            response['format'] = 'telegram'
+            response['messages'] = telegram_batches(
+                results,
+                batch_size=n8n_config.get('batch_size', 5),
+                max_length=n8n_config.get('max_telegram_message_length', 4000)
+            )
+        else:
+            response['jobs'] = project(results, fields)
+        
+        # Pass the cursor back as `since` on the next poll to receive only newer offers
+        if store is not None:
+            response['cursor'] = cursor
+            response['since'] = params['since']
+        
+        # Stages overlap (e.g. fetches run in parallel), so their sum can exceed processing_time
+        if timings is not None:
+            response['timings'] = timings.to_dict()
+        
+        logger.info(f"Scraping completed successfully. Found {len(results)} jobs in {processing_time:.2f}s (cache: {cache_info['status']})")
         return jsonify(response)
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': f"Invalid search parameters: {str(e)}",
+            'timestamp': datetime.now().isoformat()
+        }), 400
+        
     except Exception as e:
         logger.error(f"Error in job scraping: {str(e)}\\n{traceback.format_exc()}")
         return jsonify({
@@ -134,6 +429,77 @@ def get_jobs():
             'timestamp': datetime.now().isoformat()
         }), 500
 
+@app.route('/scrapes', methods=['POST'])
+def create_scrape():
+    """Queue a background scrape and return its id immediately"""
+    try:
+        params = parse_search_params(request.get_json(silent=True) or request.form or request.args)
+        if params['since'] is not None and get_job_store(config) is None:
+            return jsonify({
+                'success': False,
+                'error': 'The since cursor requires the job store (database.type: sqlite)',
+                'timestamp': datetime.now().isoformat()
+            }), 400
+        
+        task = scrape_queue.submit(params)
+        
+        return jsonify({
+            'success': True,
+            'id': task.id,
+            'status': task.status,
+            'status_url': f"/scrapes/{task.id}",
+            'timestamp': datetime.now().isoformat()
+        }), 202
+        
+    except QueueFullError as e:
+        logger.warning(str(e))
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'timestamp': datetime.now().isoformat()
+        }), 503
+        
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            'success': False,
+            'error': f"Invalid scrape parameters: {str(e)}",
+            'timestamp': datetime.now().isoformat()
+        }), 400
+
+@app.route('/scrapes/<task_id>')
+def get_scrape(task_id):
+    """Report status, progress and (once finished) results of a background scrape"""
+    task = scrape_queue.get(task_id)
+    if task is None:
+        return jsonify({
+            'success': False,
+            'error': f"Unknown scrape id: {task_id}",
+            'timestamp': datetime.now().isoformat()
+        }), 404
+    
+    return jsonify({
+        'success': task.status != 'failed',
+        'scrape': task.to_dict(),
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics: stage timings, page and job counters, and component gauges"""
+    components = {
+        'cache': response_cache.stats(),
+        'scrape_queue': scrape_queue.stats()
+    }
+    if scraper_available:
+        components['driver_pool'] = get_driver_pool(config).stats()
+    
+    for component, stats in components.items():
+        for key, value in stats.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                REGISTRY.gauge(f"job_scraper_{component}_{key}", f"{component} {key.replace('_', ' ')}").set(value)
+    
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/config')
 def get_config():
     """Get current configuration (excluding sensitive data)"""
@@ -165,7 +531,7 @@ def not_found(error):
     return jsonify({
         'success': False,
         'error': 'Endpoint not found',
-        'available_endpoints': ['/health', '/jobs', '/config'],
+        'available_endpoints': ['/health', '/jobs', '/scrapes', '/scrapes/<id>', '/metrics', '/config'],
         'timestamp': datetime.now().isoformat()
     }), 404
 
@@ -186,10 +552,13 @@ if __name__ == '__main__':
     os.makedirs('data', exist_ok=True)
     os.makedirs('output', exist_ok=True)
     
+    start_background_services()
+    
     # Run Flask app
     api_config = config.get('api', {})
     app.run(
         host=api_config.get('host', '0.0.0.0'),
         port=api_config.get('port', 5000),
-        debug=api_config.get('debug', False)
+        debug=api_config.get('debug', False),
+        threaded=True
     )
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Offline Benchmark Suite for the Scrape Pipeline
+
+Runs the scraper against synthetic (or recorded) fixtures served by the local replay
+server and reports pages/sec, parse time per page, scoring and dedup cost at several
+batch sizes, end-to-end /jobs latency and peak RSS. Results are written as JSON so runs
+on different commits can be compared.
+
+Usage:
+    python benchmark.py --output bench.json
+    python benchmark.py --compare bench.json
+"""
+
+from loguru import logger
+from datetime import datetime
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import yaml
+from replay import FixtureStore, ReplayServer, generate_fixtures, synthetic_offers
+
+# Larger is better for these metrics; everything else is a cost
+HIGHER_IS_BETTER = ('pages_per_sec', 'jobs_per_sec')
+# Workload sizes and counts, reported but not compared
+COUNTS = ('pages', 'jobs', 'runs', 'kept', 'unique', 'page_kb')
+# Changes smaller than this (in percent) are treated as noise
+NOISE_PERCENT = 5
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def benchmark_config(base_url, pages):
+    """Scraper config overrides pointing pracuj at the replay server without throttling"""
+    return {
+        'sources': {
+            'pracuj': {
+                'base_url': base_url,
+                'login_url': base_url + '/',
+                'rate_limit': 0,
+                'rate_jitter': 0,
+                'max_pages': pages,
+                'fetch': {'mode': 'http'}
+            }
+        },
+        'search': {'default_keywords': ['python engineer']},
+        'database': {'incremental': False}
+    }
+
+
+def synthetic_jobs(count, seed=1):
+    """Jobs shaped like scraper output for scoring and dedup measurements"""
+    extracted = datetime.now().isoformat()
+    jobs = []
+    for i, offer in enumerate(synthetic_offers(count, seed)):
+        job = dict(offer, source='pracuj', extracted=extracted, id=f"{i:012x}", score=0.5)
+        jobs.append(job)
+    return jobs
+
+
+def timed(function, repeat=1):
+    """Run a function `repeat` times and return (last result, best seconds)"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def bench_parse(store, repeat):
+    """Parse time per listing page with the compiled selector parser"""
+    from sources import PracujSource
+    parser = PracujSource('pracuj').parser()
+    pages = [html for _, html in store.pages()]
+
+    _, seconds = timed(lambda: [parser.parse(html) for html in pages], repeat)
+    return {
+        'pages': len(pages),
+        'parse_ms_per_page': round(seconds * 1000 / max(1, len(pages)), 3),
+        'page_kb': round(sum(len(html) for html in pages) / 1024 / max(1, len(pages)), 1)
+    }
+
+
+def bench_scrape(keywords, pages, database_path):
+    """Full fetch/parse/score/store pipeline of one search against the replay server"""
+    from job_store import JobStore
+    from scraper import JobScraper
+
+    scraper = JobScraper(job_store=JobStore(database_path))
+    scraper.email = None
+    try:
+        start = time.perf_counter()
+        jobs = scraper.scrape_pracuj(keywords, max_pages=pages)
+        seconds = time.perf_counter() - start
+    finally:
+        scraper.cleanup()
+        scraper.job_store.close()
+
+    return {
+        'pages': scraper.pages_done,
+        'jobs': len(jobs),
+        'seconds': round(seconds, 3),
+        'pages_per_sec': round(scraper.pages_done / seconds, 2) if seconds else None,
+        'jobs_per_sec': round(len(jobs) / seconds, 1) if seconds else None
+    }
+
+
+def bench_processing(sizes, repeat):
+    """Scoring/filtering and near-duplicate removal cost at several batch sizes"""
+    from dedup import deduplicate
+    from scoring import ScoringEngine
+    from scraper import JobScraper
+
+    processing_config = JobScraper().config.get('processing', {})
+    results = {}
+    for size in sizes:
+        jobs = synthetic_jobs(size)
+        engine = ScoringEngine(processing_config)
+        _, cold = timed(lambda: engine.apply(jobs))
+        kept, warm = timed(lambda: engine.apply(jobs), repeat)
+        unique, dedup_seconds = timed(lambda: deduplicate(kept))
+        results[str(size)] = {
+            'scoring_ms_cold': round(cold * 1000, 2),
+            'scoring_ms': round(warm * 1000, 2),
+            'dedup_ms': round(dedup_seconds * 1000, 2),
+            'kept': len(kept),
+            'unique': len(unique)
+        }
+        logger.info(f"Processed {size} jobs: {results[str(size)]}")
+    return results
+
+
+def bench_endpoint(keywords, runs):
+    """End-to-end latency of uncached /jobs requests through the Flask app"""
+    from app import app
+
+    client = app.test_client()
+    latencies = []
+    total = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        response = client.get('/jobs', query_string={'keywords': keywords, 'refresh': 1, 'max_results': 1000})
+        latencies.append((time.perf_counter() - start) * 1000)
+        total = response.get_json().get('total_count', 0)
+
+    latencies.sort()
+    return {
+        'runs': runs,
+        'jobs': total,
+        'latency_ms_median': round(statistics.median(latencies), 1),
+        'latency_ms_p95': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1),
+        'latency_ms_min': round(latencies[0], 1)
+    }
+
+
+def flatten(results, prefix=''):
+    """Flatten nested results into {'stage.metric': value} for comparisons"""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(current, baseline):
+    """Print metric changes relative to a previous run"""
+    now, before = flatten(current['results']), flatten(baseline['results'])
+    print(f"\nChanges vs {baseline.get('revision') or 'baseline'} ({baseline.get('timestamp')}):")
+    for name in sorted(now):
+        if name.rsplit('.', 1)[-1] in COUNTS or not before.get(name):
+            continue
+        change = (now[name] - before[name]) / before[name] * 100
+        better = change > 0 if name.endswith(HIGHER_IS_BETTER) else change < 0
+        marker = ' ' if abs(change) < NOISE_PERCENT else '+' if better else '-'
+        print(f"  {marker} {name:<40} {before[name]:>12} -> {now[name]:>12} ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the scrape pipeline")
+    parser.add_argument('--fixtures', help="recorded fixture directory (default: generate synthetic pages)")
+    parser.add_argument('--keywords', default='python engineer')
+    parser.add_argument('--pages', type=int, default=10)
+    parser.add_argument('--offers', type=int, default=50, help="offers per synthetic page")
+    parser.add_argument('--latency', type=float, default=0.05, help="replay server latency in seconds")
+    parser.add_argument('--sizes', default='1000,10000,100000', help="job counts for scoring/dedup")
+    parser.add_argument('--repeat', type=int, default=3, help="repetitions for micro-benchmarks (best is kept)")
+    parser.add_argument('--runs', type=int, default=5, help="/jobs requests to time")
+    parser.add_argument('--skip', default='', help="comma-separated stages to skip: parse,scrape,processing,endpoint")
+    parser.add_argument('--output', help="write results as JSON")
+    parser.add_argument('--compare', help="previous JSON results to compare against")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level=os.getenv('BENCHMARK_LOG_LEVEL', 'WARNING'))
+    skip = {s.strip() for s in args.skip.split(',') if s.strip()}
+
+    workdir = tempfile.mkdtemp(prefix='job-scraper-bench-')
+    if args.fixtures:
+        store = FixtureStore(args.fixtures)
+    else:
+        store = generate_fixtures(os.path.join(workdir, 'fixtures'), args.keywords, args.pages, args.offers)
+
+    server = ReplayServer(store, latency=args.latency)
+    base_url = server.start()
+
+    # Every scraper created from here on (including the app's) reads these overrides
+    config_path = os.path.join(workdir, 'config.yaml')
+    with open(config_path, 'w') as f:
+        yaml.safe_dump(benchmark_config(base_url, args.pages), f)
+    os.environ['SCRAPER_CONFIG'] = config_path
+    os.environ['DATABASE_PATH'] = os.path.join(workdir, 'jobs.db')
+    os.environ.pop('EMAIL', None)
+    os.environ.pop('PASSWORD', None)
+
+    results = {}
+    try:
+        if 'parse' not in skip:
+            results['parse'] = bench_parse(store, args.repeat)
+            results['parse']['peak_rss_mb'] = peak_rss_mb()
+        if 'scrape' not in skip:
+            results['scrape'] = bench_scrape(args.keywords, args.pages, os.path.join(workdir, 'scrape.db'))
+            results['scrape']['peak_rss_mb'] = peak_rss_mb()
+        if 'processing' not in skip:
+            sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+            results['processing'] = bench_processing(sizes, args.repeat)
+            results['processing']['peak_rss_mb'] = peak_rss_mb()
+        if 'endpoint' not in skip:
+            results['endpoint'] = bench_endpoint(args.keywords, args.runs)
+            results['endpoint']['peak_rss_mb'] = peak_rss_mb()
+    finally:
+        server.stop()
+
+    report = {
+        'revision': git_revision(),
+        'timestamp': datetime.now().isoformat(),
+        'settings': {
+            'pages': args.pages,
+            'offers_per_page': args.offers,
+            'latency': args.latency,
+            'fixtures': args.fixtures or 'synthetic'
+        },
+        'results': results,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
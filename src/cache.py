@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+TTL Response Cache with Single-Flight Coalescing
+
+Caches scrape results in memory with a time-to-live and an LRU size bound. Expired
+entries can still be served for a grace period while one background refresh runs, and
+concurrent misses for the same key wait on a single computation instead of each
+starting their own scrape.
+"""
+
+from collections import OrderedDict
+from loguru import logger
+import threading
+import time
+
+
+class _Flight:
+    """A computation in progress that other callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResponseCache:
+    """Thread-safe LRU cache with TTL, stale-while-revalidate and single-flight misses"""
+
+    def __init__(self, ttl=3600, max_entries=64, stale_ttl=0, enabled=True):
+        self.ttl = ttl
+        self.max_entries = max(1, int(max_entries))
+        self.stale_ttl = stale_ttl
+        self.enabled = enabled
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def _store(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                logger.debug(f"Evicted cache entry {evicted}")
+
+    def _run_flight(self, key, flight, compute, cacheable=None):
+        """Compute a value, publish it to waiters and store it on success
+
+        A computation that raises is never stored; its error goes to every waiter. Neither
+        is a value that `cacheable` rejects.
+        """
+        try:
+            flight.value = compute()
+            if cacheable is None or cacheable(flight.value):
+                self._store(key, flight.value)
+        except Exception as e:
+            flight.error = e
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _refresh_in_background(self, key, compute, cacheable=None):
+        with self._lock:
+            if key in self._flights:
+                return
+            flight = self._flights[key] = _Flight()
+
+        def refresh():
+            self._run_flight(key, flight, compute, cacheable)
+            if flight.error:
+                logger.warning(f"Background refresh failed for {key}: {str(flight.error)}")
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def get_or_compute(self, key, compute, cacheable=None):
+        """Return (value, info) where info reports the cache status and entry age in seconds
+
+        `cacheable(value)`, if given, decides whether a computed value is stored.
+        """
+        if not self.enabled:
+            return compute(), {'status': 'bypass', 'age': 0}
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+
+        if entry:
+            stored_at, value = entry
+            age = now - stored_at
+            if age <= self.ttl:
+                return value, {'status': 'hit', 'age': round(age, 2)}
+            if age <= self.ttl + self.stale_ttl:
+                self._refresh_in_background(key, compute, cacheable)
+                return value, {'status': 'stale', 'age': round(age, 2)}
+
+        with self._lock:
+            flight = self._flights.get(key)
+            owner = flight is None
+            if owner:
+                flight = self._flights[key] = _Flight()
+
+        if owner:
+            self._run_flight(key, flight, compute, cacheable)
+        else:
+            flight.done.wait()
+
+        if flight.error:
+            raise flight.error
+        return flight.value, {'status': 'miss' if owner else 'coalesced', 'age': 0}
+
+    def peek(self, key):
+        """Return (value, info) for a fresh entry without triggering a computation, else None"""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if not entry:
+            return None
+
+        stored_at, value = entry
+        age = time.time() - stored_at
+        if age > self.ttl:
+            return None
+        return value, {'status': 'hit', 'age': round(age, 2)}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return a snapshot of cache occupancy"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'in_flight': len(self._flights),
+                'ttl': self.ttl
+            }
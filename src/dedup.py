@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Detection with MinHash and LSH
+
+Jobs are reduced to MinHash signatures over character shingles of their normalized
+title, company, location and technologies. A banded LSH index narrows each lookup to a
+few candidate jobs, whose estimated Jaccard similarity is then checked against the
+configured threshold. Offers stored by earlier runs are kept in a long-lived index that
+is updated from the job store's change log, so repost checks only hash new offers.
+"""
+
+from functools import lru_cache
+from loguru import logger
+import numpy as np
+import re
+import threading
+import time
+import unicodedata
+import zlib
+
+# Smallest prime above 2**32, so (a * x + b) stays inside uint64 for 32-bit hashes
+HASH_PRIME = np.uint64(4294967311)
+
+_permutations = {}
+
+
+def _get_permutations(num_perm, seed):
+    """Return the (a, b) coefficients of the hash permutations, shared across indexes"""
+    key = (num_perm, seed)
+    if key not in _permutations:
+        rng = np.random.RandomState(seed)
+        a = rng.randint(1, 2 ** 32 - 1, size=num_perm, dtype=np.uint64)
+        b = rng.randint(0, 2 ** 32 - 1, size=num_perm, dtype=np.uint64)
+        _permutations[key] = (a[:, np.newaxis], b[:, np.newaxis])
+    return _permutations[key]
+
+
+@lru_cache(maxsize=None)
+def _optimal_bands(num_perm, threshold):
+    """Pick (bands, rows) minimizing false positives and negatives around the threshold"""
+    def probability(s, bands, rows):
+        return 1 - (1 - s ** rows) ** bands
+
+    steps = np.linspace(0, 1, 101)
+    below = steps[steps < threshold]
+    above = steps[steps >= threshold]
+    best, best_error = (num_perm, 1), float('inf')
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        # Areas under the false positive and false negative curves (step width 0.01)
+        false_positive = probability(below, bands, rows).sum() * 0.01
+        false_negative = (1 - probability(above, bands, rows)).sum() * 0.01
+        error = false_positive + false_negative
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+def normalize_text(text):
+    """Lowercase, strip accents and punctuation, and collapse whitespace"""
+    text = unicodedata.normalize('NFKD', str(text or '').lower())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(re.sub(r'[^\w]+', ' ', text).split())
+
+
+def job_document(job):
+    """Text representation of a job used for similarity comparisons"""
+    technologies = ' '.join(sorted(normalize_text(t) for t in job.get('technologies', [])))
+    parts = [job.get('title'), job.get('company'), job.get('location')]
+    return ' | '.join([normalize_text(p) for p in parts] + [technologies])
+
+
+class NearDuplicateIndex:
+    """LSH index of MinHash signatures supporting sub-linear near-duplicate lookups"""
+
+    def __init__(self, threshold=0.8, num_perm=128, shingle_size=4, seed=1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.a, self.b = _get_permutations(num_perm, seed)
+        self.bands, self.rows = _optimal_bands(num_perm, threshold)
+        self._buckets = [{} for _ in range(self.bands)]
+        self._signatures = {}
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def _shingle_hashes(self, job):
+        document = job_document(job)
+        k = self.shingle_size
+        shingles = {document[i:i + k] for i in range(max(1, len(document) - k + 1))}
+        return np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+    def signature(self, job):
+        """Compute the MinHash signature of a job"""
+        hashes = self._shingle_hashes(job)
+        return ((self.a * hashes + self.b) % HASH_PRIME).min(axis=1)
+
+    def signatures(self, jobs, chunk_size=500):
+        """Compute signatures for many jobs at once, returned as an (n, num_perm) array"""
+        result = np.empty((len(jobs), self.num_perm), dtype=np.uint64)
+        for start in range(0, len(jobs), chunk_size):
+            hashes = [self._shingle_hashes(job) for job in jobs[start:start + chunk_size]]
+            offsets = np.cumsum([0] + [len(h) for h in hashes[:-1]])
+            permuted = (self.a * np.concatenate(hashes) + self.b) % HASH_PRIME
+            result[start:start + len(hashes)] = np.minimum.reduceat(permuted, offsets, axis=1).T
+        return result
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def add(self, key, signature):
+        """Index a signature under a key (usually the job id)"""
+        self._signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band].setdefault(band_key, []).append(key)
+
+    def find(self, signature, accept=None):
+        """Return (key, similarity) of the most similar indexed job above the threshold, or None
+
+        Keys for which `accept(key)` is false are never returned.
+        """
+        candidates = set()
+        for band, band_key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        if accept is not None:
+            candidates = {key for key in candidates if accept(key)}
+
+        best = None
+        for key in candidates:
+            similarity = float(np.mean(self._signatures[key] == signature))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        return best
+
+
+def deduplicate(jobs, threshold=0.8, num_perm=128):
+    """Drop near-duplicate jobs, keeping the highest-scoring job of each group
+
+    The result is ordered by score, highest first.
+    """
+    index = NearDuplicateIndex(threshold, num_perm)
+    ranked = sorted(jobs, key=lambda x: x.get('score', 0), reverse=True)
+    unique_jobs = []
+
+    for position, (job, signature) in enumerate(zip(ranked, index.signatures(ranked))):
+        match = index.find(signature)
+        if match:
+            logger.debug(f"'{job.get('title')}' at {job.get('company')} is a near-duplicate ({match[1]:.2f})")
+            continue
+        index.add(position, signature)
+        unique_jobs.append(job)
+
+    return unique_jobs
+
+
+class RepostIndex:
+    """Near-duplicate index of stored jobs first seen within a sliding time window
+
+    Each lookup first adds the offers logged in the job store since the previous one, so
+    signatures are computed once per offer rather than once per run. The index is rebuilt
+    once per window to drop offers that have aged out; until then they are skipped.
+    """
+
+    def __init__(self, threshold=0.8, window=72 * 3600):
+        self.threshold = threshold
+        self.window = window
+        self._index = None
+        self._first_seen = {}
+        self._seq = 0
+        self._built = 0
+        self._lock = threading.Lock()
+
+    def _update(self, store, now):
+        if self._index is None or now - self._built > self.window:
+            self._index = NearDuplicateIndex(self.threshold)
+            self._first_seen = {}
+            self._seq = 0
+            self._built = now
+
+        rows = store.logged_since(self._seq, now - self.window)
+        if not rows:
+            return
+        for (_, first_seen, job), signature in zip(rows, self._index.signatures([job for _, _, job in rows])):
+            self._index.add(job['id'], signature)
+            self._first_seen[job['id']] = first_seen
+        self._seq = rows[-1][0]
+        logger.debug(f"Repost index updated with {len(rows)} offers ({len(self._index)} indexed)")
+
+    def find_reposts(self, store, jobs, exclude=(), now=None):
+        """Return {job id: id of the stored offer it reposts} for jobs matching an indexed offer
+
+        Offers whose ids are in `exclude` (e.g. every offer parsed by the current run) are
+        never matched.
+        """
+        now = now or time.time()
+        with self._lock:
+            self._update(store, now)
+            cutoff = now - self.window
+            first_seen = self._first_seen
+
+            def accept(key):
+                return key not in exclude and first_seen[key] >= cutoff
+
+            reposts = {}
+            for job, signature in zip(jobs, self._index.signatures(jobs)):
+                match = self._index.find(signature, accept)
+                if match:
+                    reposts[job['id']] = match[0]
+        return reposts
+
+
+_repost_indexes = {}
+_repost_indexes_lock = threading.Lock()
+
+
+def get_repost_index(store, threshold=0.8, window_hours=72):
+    """Return the shared repost index for a job store, dedup threshold and window"""
+    key = (store.path, threshold, window_hours)
+    with _repost_indexes_lock:
+        if key not in _repost_indexes:
+            _repost_indexes[key] = RepostIndex(threshold, window_hours * 3600)
+        return _repost_indexes[key]
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Warm WebDriver Pool with Persisted Login Sessions
+
+Keeps a bounded set of headless Chrome instances alive across scrapes, health-checks
+them on checkout, recycles them after a page budget or memory ceiling, and stores
+site login cookies on disk so a fresh driver can skip the login flow.
+"""
+
+from loguru import logger
+import json
+import os
+import threading
+import time
+
+
+class DriverPoolError(Exception):
+    """Raised when the pool cannot hand out a driver"""
+    pass
+
+
+def _process_tree_rss_mb(root_pid):
+    """Return the resident memory (MB) of a process and its descendants, or None if unknown"""
+    if not root_pid or not os.path.isdir('/proc'):
+        return None
+
+    children = {}
+    rss_pages = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                stat = f.read()
+            # The command name may contain spaces, so split after the closing paren
+            fields = stat[stat.rindex(')') + 2:].split()
+            pid, ppid = int(entry), int(fields[1])
+            children.setdefault(ppid, []).append(pid)
+            rss_pages[pid] = int(fields[21])
+        except (OSError, ValueError, IndexError):
+            continue
+
+    if root_pid not in rss_pages:
+        return None
+
+    total, stack = 0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += rss_pages.get(pid, 0)
+        stack.extend(children.get(pid, []))
+
+    return total * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+
+class PooledDriver:
+    """A WebDriver checked out of the pool together with its usage bookkeeping"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.created = time.time()
+        self.pages = 0
+        self.sessions = {}
+
+    def record_page(self):
+        """Count one page load against this driver's recycle budget"""
+        self.pages += 1
+
+    def mark_session(self, site):
+        """Record that this browser is logged in to a site, as confirmed just now"""
+        self.sessions[site] = time.time()
+
+    def drop_session(self, site):
+        """Forget this browser's login to a site"""
+        self.sessions.pop(site, None)
+
+    def session_age(self, site):
+        """Seconds since this browser's login to a site was last confirmed, or None without one"""
+        confirmed = self.sessions.get(site)
+        return time.time() - confirmed if confirmed is not None else None
+
+    def memory_mb(self):
+        """Resident memory of the chromedriver process tree in MB, if available"""
+        try:
+            pid = self.driver.service.process.pid
+        except Exception:
+            return None
+        return _process_tree_rss_mb(pid)
+
+    def is_alive(self):
+        """Cheap round-trip to the browser to confirm the session is still usable"""
+        try:
+            self.driver.execute_script('return 1')
+            return True
+        except Exception:
+            return False
+
+    def quit(self):
+        """Quit the underlying browser, ignoring errors from an already dead session"""
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.debug(f"Error quitting pooled WebDriver: {str(e)}")
+
+
+class SessionStore:
+    """Disk-backed store of per-site login cookies"""
+
+    def __init__(self, directory='data/sessions', max_age=43200):
+        self.directory = directory
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+    def _path(self, site):
+        return os.path.join(self.directory, f'{site}_cookies.json')
+
+    def save(self, site, cookies):
+        """Persist the cookies of a logged-in session"""
+        with self._lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                tmp_path = self._path(site) + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'saved': time.time(), 'cookies': cookies}, f)
+                os.replace(tmp_path, self._path(site))
+                logger.debug(f"Saved {len(cookies)} session cookies for {site}")
+            except OSError as e:
+                logger.warning(f"Failed to save session cookies for {site}: {str(e)}")
+
+    def load(self, site):
+        """Return stored cookies for a site, or None if missing or expired"""
+        with self._lock:
+            try:
+                with open(self._path(site), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                return None
+
+        now = time.time()
+        if now - data.get('saved', 0) > self.max_age:
+            logger.info(f"Stored session for {site} is older than {self.max_age}s")
+            return None
+
+        cookies = data.get('cookies') or []
+        if any(c.get('expiry') and c['expiry'] <= now for c in cookies):
+            logger.info(f"Stored session for {site} has expired cookies")
+            return None
+
+        return cookies
+
+    def invalidate(self, site):
+        """Forget the stored session so the next checkout logs in again"""
+        with self._lock:
+            try:
+                os.remove(self._path(site))
+            except OSError:
+                pass
+
+
+class DriverPool:
+    """Thread-safe pool of warm WebDriver instances"""
+
+    def __init__(self, config=None):
+        pool_config = (config or {}).get('chrome', {}).get('pool', {})
+        self.size = max(1, int(pool_config.get('size', 2)))
+        self.max_pages = int(pool_config.get('max_pages_per_driver', 50))
+        self.max_memory_mb = pool_config.get('max_memory_mb', 1024)
+        self.acquire_timeout = pool_config.get('acquire_timeout', 120)
+        self.session_check_interval = pool_config.get('session_check_interval', 300)
+        self.sessions = SessionStore(
+            pool_config.get('session_dir', 'data/sessions'),
+            pool_config.get('session_max_age', 43200)
+        )
+
+        self._idle = []
+        self._leased = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        logger.info(f"DriverPool initialized with size {self.size}")
+
+    def _needs_recycle(self, pooled):
+        """Check the page budget and memory ceiling of a driver"""
+        if self.max_pages and pooled.pages >= self.max_pages:
+            logger.info(f"Recycling WebDriver after {pooled.pages} pages")
+            return True
+
+        if self.max_memory_mb:
+            memory = pooled.memory_mb()
+            if memory is not None and memory > self.max_memory_mb:
+                logger.info(f"Recycling WebDriver using {memory:.0f}MB (limit {self.max_memory_mb}MB)")
+                return True
+
+        return False
+
+    def warm(self, factory):
+        """Start drivers until the pool holds `size` instances"""
+        started = 0
+        while True:
+            with self._cond:
+                if self._closed or len(self._idle) + self._leased >= self.size:
+                    break
+                # Reserve the slot while the browser starts outside the lock
+                self._leased += 1
+            try:
+                pooled = PooledDriver(factory())
+            except Exception as e:
+                with self._cond:
+                    self._leased -= 1
+                    self._cond.notify()
+                logger.error(f"Failed to warm WebDriver pool: {str(e)}")
+                break
+            with self._cond:
+                self._leased -= 1
+                self._idle.append(pooled)
+                self._cond.notify()
+            started += 1
+
+        if started:
+            logger.info(f"Warmed {started} WebDriver instance(s)")
+        return started
+
+    def acquire(self, factory):
+        """Check out a healthy driver, starting a new one with `factory` if needed"""
+        deadline = time.time() + self.acquire_timeout
+
+        while True:
+            with self._cond:
+                while not self._idle and self._leased >= self.size and not self._closed:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise DriverPoolError(f"No WebDriver available after {self.acquire_timeout}s")
+                    self._cond.wait(remaining)
+
+                if self._closed:
+                    raise DriverPoolError("WebDriver pool is closed")
+
+                pooled = self._idle.pop() if self._idle else None
+                self._leased += 1
+
+            if pooled is None:
+                try:
+                    pooled = PooledDriver(factory())
+                    logger.info("Started new pooled WebDriver")
+                except Exception:
+                    with self._cond:
+                        self._leased -= 1
+                        self._cond.notify()
+                    raise
+                return pooled
+
+            if pooled.is_alive() and not self._needs_recycle(pooled):
+                return pooled
+
+            logger.warning("Discarding unhealthy pooled WebDriver")
+            self.discard(pooled)
+
+    def release(self, pooled):
+        """Return a driver to the pool, recycling it if it is spent or dead"""
+        if not pooled.is_alive() or self._needs_recycle(pooled):
+            self.discard(pooled)
+            return
+
+        with self._cond:
+            self._leased -= 1
+            if self._closed:
+                pooled.quit()
+            else:
+                self._idle.append(pooled)
+            self._cond.notify()
+
+    def discard(self, pooled):
+        """Quit a leased driver and free its slot"""
+        pooled.quit()
+        with self._cond:
+            self._leased -= 1
+            self._cond.notify()
+
+    def stats(self):
+        """Return a snapshot of pool occupancy"""
+        with self._cond:
+            return {
+                'size': self.size,
+                'idle': len(self._idle),
+                'leased': self._leased
+            }
+
+    def close(self):
+        """Quit all idle drivers; leased drivers are quit when released"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+
+        for pooled in idle:
+            pooled.quit()
+        logger.info("DriverPool closed")
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_driver_pool(config=None):
+    """Return the process-wide driver pool, creating it on first use"""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None or _shared_pool._closed:
+            _shared_pool = DriverPool(config)
+        return _shared_pool
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Page Fetchers for Job Sources
+
+Listing pages are fetched with a pooled keep-alive HTTP client by default. A Selenium
+browser is only started when the plain HTTP response does not contain the content the
+parser needs (for example when the page is rendered client-side or blocked).
+"""
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from loguru import logger
+from urllib.parse import urljoin
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                      '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+
+class FetchError(Exception):
+    """Raised when a page cannot be fetched by any available method"""
+    pass
+
+
+class FetchResult:
+    """HTML of a fetched page together with how it was obtained"""
+
+    def __init__(self, url, html, via, status=None):
+        self.url = url
+        self.html = html
+        self.via = via
+        self.status = status
+
+
+class BaseFetcher:
+    """Common URL handling for fetchers bound to a source's base URL"""
+
+    via = 'base'
+
+    def __init__(self, base_url=''):
+        self.base_url = base_url.rstrip('/') + '/' if base_url else ''
+
+    def resolve(self, url):
+        """Turn a source-relative path into an absolute URL"""
+        if not self.base_url:
+            return url
+        return urljoin(self.base_url, url.lstrip('/'))
+
+    def fetch(self, url, ready_selector=None):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class HttpFetcher(BaseFetcher):
+    """Keep-alive HTTP fetcher backed by a pooled requests session"""
+
+    via = 'http'
+
+    def __init__(self, base_url='', timeout=15, pool_size=10, user_agent=DEFAULT_USER_AGENT):
+        super().__init__(base_url)
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=1)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': user_agent,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'pl-PL,pl;q=0.9,en;q=0.8',
+            'Connection': 'keep-alive'
+        })
+
+    def load_cookies(self, cookies):
+        """Copy WebDriver-style cookie dicts into the HTTP session"""
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie['name'],
+                cookie['value'],
+                domain=cookie.get('domain', ''),
+                path=cookie.get('path', '/')
+            )
+        logger.debug(f"Loaded {len(cookies)} cookies into HTTP session")
+
+    def fetch(self, url, ready_selector=None):
+        """Fetch a page over HTTP; raises FetchError on transport or HTTP errors"""
+        url = self.resolve(url)
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise FetchError(f"HTTP request failed for {url}: {str(e)}")
+
+        if response.status_code >= 400:
+            raise FetchError(f"HTTP {response.status_code} for {url}")
+
+        return FetchResult(url, response.text, self.via, status=response.status_code)
+
+    def close(self):
+        self.session.close()
+
+
+class SeleniumFetcher(BaseFetcher):
+    """Browser fetcher that waits for the page to render before returning its DOM"""
+
+    via = 'selenium'
+
+    def __init__(self, driver_provider, base_url='', wait_timeout=20):
+        super().__init__(base_url)
+        self.driver_provider = driver_provider
+        self.wait_timeout = wait_timeout
+        # A single browser can only render one page at a time
+        self._lock = threading.Lock()
+
+    def fetch(self, url, ready_selector=None):
+        """Load a page in the browser; TimeoutException propagates if it never renders"""
+        url = self.resolve(url)
+        with self._lock:
+            driver = self.driver_provider()
+            try:
+                driver.get(url)
+            except Exception as e:
+                raise FetchError(f"Failed to load page: {str(e)}")
+
+            if ready_selector:
+                WebDriverWait(driver, self.wait_timeout).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, ready_selector))
+                )
+
+            return FetchResult(url, driver.page_source, self.via)
+
+
+class FallbackFetcher(BaseFetcher):
+    """Try the HTTP fetcher first and fall back to the browser when content is missing"""
+
+    via = 'fallback'
+
+    def __init__(self, primary, fallback, content_check=None):
+        super().__init__()
+        self.primary = primary
+        self.fallback = fallback
+        self.content_check = content_check
+
+    def _needs_browser(self, result):
+        """Check whether an HTTP response lacks the content the parser needs"""
+        if not self.content_check:
+            return False
+        return not self.content_check(result.html)
+
+    def fetch(self, url, ready_selector=None):
+        try:
+            result = self.primary.fetch(url, ready_selector)
+            if not self._needs_browser(result):
+                return result
+            logger.info(f"HTTP response for {result.url} is missing required content, using browser")
+        except FetchError as e:
+            logger.info(f"{str(e)} - falling back to browser")
+
+        return self.fallback.fetch(url, ready_selector)
+
+    def close(self):
+        self.primary.close()
+        self.fallback.close()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Compact Output Formats for /jobs
+
+Field projection, pre-rendered Telegram message batches and response body compression,
+so clients such as the n8n workflow receive only what they display instead of reshaping
+full job dicts themselves.
+"""
+
+import gzip
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+OUTPUT_FORMATS = ('json', 'telegram')
+JOB_SEPARATOR = '\n' + '-' * 30 + '\n\n'
+TRUNCATION_MARK = '…'
+
+
+def parse_fields(value):
+    """Parse a `fields` projection (comma-separated string or list); None keeps every field"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = value.split(',')
+    fields = []
+    for field in value:
+        field = field.strip()
+        if field and field not in fields:
+            fields.append(field)
+    return fields or None
+
+
+def parse_format(value):
+    """Validate an output format name; None means the default JSON document"""
+    output_format = (value or 'json').strip().lower()
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown format: {value} (expected one of {', '.join(OUTPUT_FORMATS)})")
+    return output_format
+
+
+def project(jobs, fields):
+    """Reduce every job to the requested fields, skipping fields a job does not have"""
+    if not fields:
+        return jobs
+    return [{field: job[field] for field in fields if field in job} for job in jobs]
+
+
+def telegram_length(text):
+    """Message length as Telegram counts it, in UTF-16 code units (emoji count twice)"""
+    return len(text.encode('utf-16-le')) // 2
+
+
+def truncate(text, max_length):
+    """Cut text to at most max_length Telegram characters, marking the cut"""
+    if telegram_length(text) <= max_length:
+        return text
+    limit = max_length - telegram_length(TRUNCATION_MARK)
+    kept, length = [], 0
+    for char in text:
+        length += telegram_length(char)
+        if length > limit:
+            break
+        kept.append(char)
+    return ''.join(kept).rstrip() + TRUNCATION_MARK
+
+
+def render_job(job):
+    """Plain-text Telegram entry for one job"""
+    technologies = ', '.join(job.get('technologies') or []) or 'Technologies not listed'
+    lines = [
+        f"📌 {job.get('title') or 'No title'}",
+        f"🏢 Company: {job.get('company') or 'Unknown company'}",
+        f"📍 Location: {job.get('location') or 'Location not specified'}",
+        f"💡 Tech: {technologies}"
+    ]
+    if job.get('link') and job['link'] != 'N/A':
+        lines.append(f"🔗 Link: {job['link']}")
+    if job.get('score'):
+        lines.append(f"⭐ Match: {round(job['score'] * 100)}%")
+    return '\n'.join(lines) + '\n'
+
+
+def telegram_batches(jobs, batch_size=5, max_length=4000):
+    """Group rendered jobs into messages of at most batch_size jobs and max_length characters
+
+    A job that would push a message over the length limit starts the next message; a
+    single job longer than the limit is truncated.
+    """
+    batch_size = max(1, int(batch_size))
+    groups = []
+    current, current_length = [], 0
+    for job in jobs:
+        text = truncate(render_job(job), max_length)
+        length = telegram_length(text)
+        joined = current_length + telegram_length(JOB_SEPARATOR) + length if current else length
+        if current and (len(current) >= batch_size or joined > max_length):
+            groups.append(current)
+            current, joined = [], length
+        current.append(text)
+        current_length = joined
+    if current:
+        groups.append(current)
+
+    return [{
+        'message': JOB_SEPARATOR.join(group),
+        'batch_number': number,
+        'total_batches': len(groups),
+        'jobs_in_batch': len(group)
+    } for number, group in enumerate(groups, 1)]
+
+
+def accepted_encodings():
+    """Content codings this server can produce, most preferred first"""
+    return ['br', 'gzip'] if BROTLI_AVAILABLE else ['gzip']
+
+
+def compress(data, encoding, level=6):
+    """Compress a response body with gzip or brotli"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=min(11, level))
+    return gzip.compress(data, compresslevel=level)
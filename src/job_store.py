@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+SQLite Job Store
+
+Persists scraped job offers so later runs can tell which offers have already been
+seen. Each page of results is written as one batch inside a single transaction, and
+every newly discovered offer is appended to a change log whose monotonically increasing
+sequence numbers serve as delta feed cursors. Running searches also checkpoint their
+progress here so an interrupted run can resume where it stopped.
+"""
+
+from loguru import logger
+import json
+import os
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    link TEXT,
+    score REAL,
+    data TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    recorded REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_changes_job_id ON changes (job_id);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    live INTEGER NOT NULL,
+    params TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    job_ids TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+"""
+
+# SQLite limits the number of bound parameters per statement
+MAX_VARIABLES = 900
+
+
+class JobStore:
+    """Thread-safe SQLite store of job offers keyed by job id"""
+
+    def __init__(self, path='data/jobs.db'):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.executescript(SCHEMA)
+
+        logger.info(f"JobStore opened at {path}")
+
+    def _select_in(self, query, ids, params=()):
+        """Run a `... IN ({placeholders})` query over ids in chunks; caller holds the lock"""
+        ids = list(ids)
+        rows = []
+        for start in range(0, len(ids), MAX_VARIABLES):
+            chunk = ids[start:start + MAX_VARIABLES]
+            placeholders = ','.join('?' * len(chunk))
+            rows.extend(self._conn.execute(query.format(placeholders=placeholders), list(params) + chunk))
+        return rows
+
+    def save_jobs(self, jobs):
+        """Insert new jobs and refresh known ones in a single transaction; returns the new ids"""
+        if not jobs:
+            return set()
+
+        now = time.time()
+        rows = [(
+            job['id'],
+            job.get('source', 'unknown'),
+            job.get('title'),
+            job.get('company'),
+            job.get('location'),
+            job.get('link'),
+            job.get('score'),
+            json.dumps(job, ensure_ascii=False),
+            now,
+            now
+        ) for job in jobs]
+
+        with self._lock:
+            # Checked under the lock so concurrent saves never log the same offer twice
+            known = {row['id'] for row in self._select_in(
+                'SELECT id FROM jobs WHERE id IN ({placeholders})', (job['id'] for job in jobs))}
+            new_ids = []
+            for job in jobs:
+                if job['id'] not in known:
+                    known.add(job['id'])
+                    new_ids.append(job['id'])
+
+            with self._conn:
+                self._conn.executemany(
+                    """
+                    INSERT INTO jobs (id, source, title, company, location, link, score, data, first_seen, last_seen)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        score = excluded.score,
+                        data = excluded.data,
+                        last_seen = excluded.last_seen
+                    """,
+                    rows
+                )
+                self._conn.executemany(
+                    'INSERT INTO changes (job_id, recorded) VALUES (?, ?)',
+                    [(job_id, now) for job_id in new_ids]
+                )
+
+        logger.debug(f"Stored {len(jobs)} jobs ({len(new_ids)} new)")
+        return set(new_ids)
+
+    def logged_since(self, seq, since=None):
+        """Return (seq, first_seen, job) for offers logged after change `seq`, oldest first
+
+        With `since`, only offers first seen at or after that time are returned.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT changes.seq, changes.recorded, jobs.data FROM changes
+                JOIN jobs ON jobs.id = changes.job_id
+                WHERE changes.seq > ? AND changes.recorded >= ?
+                ORDER BY changes.seq
+                """,
+                (int(seq), since if since is not None else 0)
+            ).fetchall()
+        return [(row['seq'], row['recorded'], json.loads(row['data'])) for row in rows]
+
+    def get_jobs_by_ids(self, ids):
+        """Return the stored jobs with the given ids, in the order of `ids`"""
+        ids = list(ids)
+        with self._lock:
+            rows = self._select_in('SELECT id, data FROM jobs WHERE id IN ({placeholders})', ids)
+        jobs = {row['id']: json.loads(row['data']) for row in rows}
+        return [jobs[job_id] for job_id in ids if job_id in jobs]
+
+    def claim_checkpoint(self, key, owner, params, max_age=None, live_timeout=None, resume=True):
+        """Take over a search's checkpoint for a new run; returns (claimed, checkpoint)
+
+        `claimed` is False while another run of the search is live, i.e. it checkpointed
+        within the last `live_timeout` seconds. `checkpoint` is the progress a failed or
+        crashed run left behind, or None if there is none, it has expired or `resume` is
+        False; the claimed checkpoint starts from it.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT owner, live, page, job_ids, updated FROM checkpoints WHERE key = ?', (key,)).fetchone()
+            if (row is not None and row['live'] and row['owner'] != owner
+                    and (live_timeout is None or now - row['updated'] <= live_timeout)):
+                return False, None
+
+            checkpoint = None
+            if resume and row is not None and row['page'] > 0 and (max_age is None or now - row['updated'] <= max_age):
+                checkpoint = {'page': row['page'], 'job_ids': json.loads(row['job_ids']), 'updated': row['updated']}
+
+            with self._conn:
+                self._conn.execute(
+                    """
+                    INSERT OR REPLACE INTO checkpoints (key, owner, live, params, page, job_ids, updated)
+                    VALUES (?, ?, 1, ?, ?, ?, ?)
+                    """,
+                    (key, owner, json.dumps(params, ensure_ascii=False),
+                     checkpoint['page'] if checkpoint else 0,
+                     json.dumps(checkpoint['job_ids'] if checkpoint else []), now)
+                )
+        return True, checkpoint
+
+    def save_checkpoint(self, key, owner, page, job_ids):
+        """Record that the run owning a search's checkpoint completed `page` and found `job_ids` so far"""
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    'UPDATE checkpoints SET page = ?, job_ids = ?, updated = ? WHERE key = ? AND owner = ?',
+                    (int(page), json.dumps(list(job_ids)), time.time(), key, owner)
+                )
+
+    def release_checkpoint(self, key, owner, keep=False):
+        """End a run's claim on a checkpoint, keeping it for a later run to resume or deleting it"""
+        with self._lock:
+            with self._conn:
+                if keep:
+                    self._conn.execute('UPDATE checkpoints SET live = 0 WHERE key = ? AND owner = ?', (key, owner))
+                else:
+                    self._conn.execute('DELETE FROM checkpoints WHERE key = ? AND owner = ?', (key, owner))
+
+    def cursor(self):
+        """Sequence number of the latest change log entry (0 when empty)"""
+        with self._lock:
+            return self._conn.execute('SELECT COALESCE(MAX(seq), 0) FROM changes').fetchone()[0]
+
+    def new_since(self, cursor, ids):
+        """Return {job_id: seq} for the `ids` first discovered after the given cursor"""
+        with self._lock:
+            rows = self._select_in('SELECT job_id, seq FROM changes WHERE seq > ? AND job_id IN ({placeholders})',
+                                   ids, (int(cursor),))
+        return {row['job_id']: row['seq'] for row in rows}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+
+def get_job_store(config=None):
+    """Return the process-wide job store, or None if no SQLite database is configured"""
+    global _shared_store
+    db_config = (config or {}).get('database', {})
+    if db_config.get('type', 'sqlite') != 'sqlite':
+        return None
+
+    with _shared_store_lock:
+        if _shared_store is None:
+            path = os.getenv('DATABASE_PATH', db_config.get('path', 'data/jobs.db'))
+            _shared_store = JobStore(path)
+        return _shared_store
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Lightweight Metrics and Stage Timing
+
+Thread-safe counters, gauges and histograms rendered in the Prometheus text exposition
+format, plus `span`/`stage` helpers that time a scrape stage into the shared histogram
+and, optionally, into a per-request StageTimings breakdown.
+"""
+
+from contextlib import contextmanager
+import bisect
+import functools
+import threading
+import time
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + (list(extra.items()) if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.label_names)
+
+    def _samples(self):
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for suffix, key, extra, value in self._samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(self.label_names, key, extra)} {_format_value(value)}")
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing total per label set"""
+
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _samples(self):
+        with self._lock:
+            return [('', key, None, value) for key, value in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    """Current value per label set"""
+
+    type = 'gauge'
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def _samples(self):
+        with self._lock:
+            return [('', key, None, value) for key, value in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    """Bucketed observations with a running sum and count per label set"""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _samples(self):
+        samples = []
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += bucket_count
+                    samples.append(('_bucket', key, {'le': _format_value(bound)}, cumulative))
+                samples.append(('_sum', key, None, total))
+                samples.append(('_count', key, None, count))
+        return samples
+
+
+class MetricsRegistry:
+    """Named metrics rendered together for the /metrics endpoint"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric_class, name, *args, **kwargs):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = metric_class(name, *args, **kwargs)
+            return self._metrics[name]
+
+    def counter(self, name, documentation, labels=()):
+        return self._register(Counter, name, documentation, labels)
+
+    def gauge(self, name, documentation, labels=()):
+        return self._register(Gauge, name, documentation, labels)
+
+    def histogram(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, documentation, labels, buckets)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'job_scraper_stage_seconds', 'Time spent in each scrape stage (stages may nest)', ('source', 'stage'))
+PAGES_FETCHED = REGISTRY.counter(
+    'job_scraper_pages_fetched_total', 'Listing pages fetched', ('source', 'via'))
+PAGE_FAILURES = REGISTRY.counter(
+    'job_scraper_page_failures_total', 'Listing pages that failed to load or parse', ('source', 'reason'))
+FETCH_RETRIES = REGISTRY.counter(
+    'job_scraper_fetch_retries_total', 'Pages fetched again in the browser after the HTTP attempt', ('source',))
+RATE_LIMIT_WAIT = REGISTRY.counter(
+    'job_scraper_rate_limit_wait_seconds_total', 'Seconds spent waiting for the rate limiter', ('source',))
+JOBS_PARSED = REGISTRY.counter(
+    'job_scraper_jobs_parsed_total', 'Jobs extracted from listing pages', ('source',))
+JOBS_DROPPED = REGISTRY.counter(
+    'job_scraper_jobs_dropped_total', 'Jobs removed by dedup and filters', ('reason',))
+DRIVER_RESTARTS = REGISTRY.counter(
+    'job_scraper_driver_restarts_total', 'Unresponsive WebDrivers replaced during a scrape', ('source',))
+SEARCH_RESUMES = REGISTRY.counter(
+    'job_scraper_search_resumes_total', 'Searches resumed from a checkpoint', ('source',))
+
+
+class StageTimings:
+    """Per-request breakdown of time spent in each stage"""
+
+    def __init__(self):
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        with self._lock:
+            entry = self._stages.setdefault(stage, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def to_dict(self):
+        with self._lock:
+            return {stage: {'count': count, 'seconds': round(seconds, 4)}
+                    for stage, (count, seconds) in sorted(self._stages.items())}
+
+
+@contextmanager
+def span(stage, source='all', timings=None):
+    """Time a block as a stage of a source, recording it in the histogram and timings"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, source=source, stage=stage)
+        if timings is not None:
+            timings.add(stage, elapsed)
+
+
+def stage(name, source='all'):
+    """Decorator timing a method as a stage, using the instance's `timings` if it has one"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with span(name, source, getattr(self, 'timings', None)):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
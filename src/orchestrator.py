@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Parallel Scrape Orchestrator
+
+Fans a search out into one task per (source, keywords) pair and runs the tasks on a
+thread pool. Every task gets its own worker scraper, and with it its own fetchers and
+driver lease, so a sweep takes about as long as its slowest task. Jobs from all tasks
+are handed back on one stream for a shared dedup and scoring stage.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from loguru import logger
+import queue
+import threading
+import time
+
+# Marks the end of one task's output on the results queue
+_TASK_DONE = object()
+
+
+class SourceTask:
+    """One search of one source"""
+
+    def __init__(self, source, keywords):
+        self.source = source
+        self.keywords = keywords
+
+    def __repr__(self):
+        return f"{self.source}:{self.keywords!r}"
+
+
+def plan_tasks(sources, keywords_list):
+    """Cross sources with keyword queries, skipping repeated queries"""
+    queries = []
+    for keywords in keywords_list:
+        keywords = ' '.join(keywords.split())
+        if keywords and keywords.lower() not in {q.lower() for q in queries}:
+            queries.append(keywords)
+    return [SourceTask(source, keywords) for source in sources for keywords in queries]
+
+
+class ScrapeOrchestrator:
+    """Runs source tasks in parallel and streams their jobs as pages are parsed
+
+    `worker_factory(progress_callback)` must return a scraper with `iter_source`,
+    `cleanup` and a `partial` flag; it is called once per task, inside the task's thread.
+    Tasks that fail are logged and listed in `failures` as (task, error) pairs, and tasks
+    whose worker kept partial results after a failure are listed in `partial`.
+    """
+
+    def __init__(self, worker_factory, max_workers=4, progress_callback=None):
+        self.worker_factory = worker_factory
+        self.max_workers = max(1, int(max_workers))
+        self.progress_callback = progress_callback
+        self.failures = []
+        self.partial = []
+        self._progress = {}
+        self._progress_lock = threading.Lock()
+
+    def _task_progress(self, index):
+        """Progress callback for one task that reports totals across all tasks"""
+        def report(pages_done, jobs_found):
+            with self._progress_lock:
+                self._progress[index] = (pages_done, jobs_found)
+                pages = sum(p for p, _ in self._progress.values())
+                jobs = sum(j for _, j in self._progress.values())
+            if self.progress_callback:
+                self.progress_callback(pages, jobs)
+        return report
+
+    def _run_task(self, index, task, results, cancelled, options):
+        start_time = time.time()
+        count = 0
+        worker = None
+        try:
+            worker = self.worker_factory(self._task_progress(index))
+            jobs = worker.iter_source(task.source, task.keywords, **options)
+            try:
+                for job in jobs:
+                    if cancelled.is_set():
+                        break
+                    results.put(job)
+                    count += 1
+            finally:
+                jobs.close()
+            if worker.partial and not cancelled.is_set():
+                self.partial.append(task)
+            logger.info(f"Task {task} finished with {count} jobs in {time.time() - start_time:.2f}s")
+        except Exception as e:
+            logger.error(f"Task {task} failed: {str(e)}")
+            self.failures.append((task, e))
+        finally:
+            if worker:
+                worker.cleanup()
+            results.put(_TASK_DONE)
+
+    def iter_jobs(self, tasks, **options):
+        """Yield jobs from all tasks in the order they are scraped
+
+        Options are passed to each worker's `iter_source`. Closing the generator stops the
+        remaining tasks after their current page.
+        """
+        if not tasks:
+            return
+
+        results = queue.Queue()
+        cancelled = threading.Event()
+        workers = min(self.max_workers, len(tasks))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape-task")
+        logger.info(f"Running {len(tasks)} scrape tasks on {workers} workers: {tasks}")
+
+        try:
+            for index, task in enumerate(tasks):
+                executor.submit(self._run_task, index, task, results, cancelled, options)
+
+            remaining = len(tasks)
+            while remaining:
+                item = results.get()
+                if item is _TASK_DONE:
+                    remaining -= 1
+                    continue
+                yield item
+        finally:
+            cancelled.set()
+            executor.shutdown(wait=False, cancel_futures=True)
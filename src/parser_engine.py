@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Config-Driven Listing Page Parser
+
+Compiles the CSS selectors configured under `sources.<name>.selectors` once per source
+and applies them to the offers section of a listing page. lxml (with cssselect) is used
+when available; BeautifulSoup with precompiled soupsieve selectors is the fallback.
+"""
+
+from bs4 import BeautifulSoup
+import soupsieve
+from loguru import logger
+import threading
+
+try:
+    from lxml import html as lxml_html
+    from lxml.cssselect import CSSSelector
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Selector keys understood by the parser; missing keys are simply not extracted
+TEXT_FIELDS = ('title', 'company', 'location')
+SKIP_FIELDS = ('applied', 'saved')
+
+
+class ParsedPage:
+    """Offers extracted from one listing page plus its pagination state"""
+
+    def __init__(self, section_found, offers, has_next, skipped=0):
+        self.section_found = section_found
+        self.offers = offers
+        self.has_next = has_next
+        self.skipped = skipped
+
+
+class _LxmlBackend:
+    name = 'lxml'
+
+    def __init__(self, selectors):
+        self.compiled = {key: CSSSelector(selector) for key, selector in selectors.items() if selector}
+
+    def document(self, html):
+        return lxml_html.fromstring(html)
+
+    def select(self, key, node):
+        selector = self.compiled.get(key)
+        return selector(node) if selector is not None else []
+
+    def text(self, node):
+        return ''.join(part.strip() for part in node.itertext())
+
+    def attr(self, node, name):
+        return node.get(name)
+
+
+class _SoupBackend:
+    name = 'bs4'
+
+    def __init__(self, selectors):
+        self.compiled = {key: soupsieve.compile(selector) for key, selector in selectors.items() if selector}
+        self.features = 'lxml' if LXML_AVAILABLE else 'html.parser'
+
+    def document(self, html):
+        return BeautifulSoup(html, self.features)
+
+    def select(self, key, node):
+        selector = self.compiled.get(key)
+        return selector.select(node) if selector is not None else []
+
+    def text(self, node):
+        return node.get_text(strip=True)
+
+    def attr(self, node, name):
+        return node.get(name)
+
+
+class SelectorParser:
+    """Parser for one source built from its configured CSS selectors"""
+
+    def __init__(self, selectors, backend='auto'):
+        self.selectors = dict(selectors)
+        self.section_marker = self._attribute_marker(self.selectors.get('offers_section', ''))
+
+        if backend in ('auto', 'lxml') and LXML_AVAILABLE:
+            self.backend = _LxmlBackend(self.selectors)
+        else:
+            if backend == 'lxml':
+                logger.warning("lxml/cssselect not installed - falling back to BeautifulSoup parser")
+            self.backend = _SoupBackend(self.selectors)
+
+    @staticmethod
+    def _attribute_marker(selector):
+        """Derive a substring that must appear in HTML containing the selector, if it has one"""
+        if '=' not in selector or not selector.endswith(']'):
+            return None
+        attr, _, value = selector[selector.rindex('[') + 1:-1].partition('=')
+        return value.strip('\'"') if attr and value else None
+
+    def has_offers_section(self, html):
+        """Cheap check used to decide whether a page needs to be rendered in a browser"""
+        if self.section_marker and self.section_marker not in html:
+            return False
+        document = self.backend.document(html)
+        return bool(self.backend.select('offers_section', document))
+
+    def shows_logged_out(self, html):
+        """True when the page has the source's `logged_out` marker, e.g. a sign-in link"""
+        if 'logged_out' not in self.selectors:
+            return False
+        document = self.backend.document(html)
+        return bool(self.backend.select('logged_out', document))
+
+    def _first_text(self, key, node):
+        found = self.backend.select(key, node)
+        return self.backend.text(found[0]) if found else None
+
+    def _parse_offer(self, node):
+        """Extract raw fields from one offer element, or None if it should be skipped"""
+        if any(self.backend.select(key, node) for key in SKIP_FIELDS):
+            return None
+
+        offer = {field: self._first_text(field, node) for field in TEXT_FIELDS}
+        offer['technologies'] = [self.backend.text(tech) for tech in self.backend.select('technologies', node)]
+
+        links = self.backend.select('link', node)
+        offer['link'] = self.backend.attr(links[0], 'href') if links else None
+        return offer
+
+    def parse(self, html):
+        """Parse a listing page; only the offers section is searched for offers"""
+        document = self.backend.document(html)
+        sections = self.backend.select('offers_section', document)
+
+        next_buttons = self.backend.select('next_page', document)
+        has_next = bool(next_buttons) and self.backend.attr(next_buttons[0], 'disabled') is None
+
+        if not sections:
+            return ParsedPage(False, [], has_next)
+
+        offers, skipped = [], 0
+        for node in self.backend.select('job_offer', sections[0]):
+            try:
+                offer = self._parse_offer(node)
+            except Exception as e:
+                logger.warning(f"Failed to parse job element: {str(e)}")
+                offer = None
+            if offer is None:
+                skipped += 1
+            else:
+                offers.append(offer)
+
+        return ParsedPage(True, offers, has_next, skipped)
+
+
+_parsers = {}
+_parsers_lock = threading.Lock()
+
+
+def get_parser(source, selectors, backend='auto'):
+    """Return the compiled parser for a source, compiling its selectors on first use"""
+    key = (source, tuple(sorted(selectors.items())), backend)
+    with _parsers_lock:
+        if key not in _parsers:
+            _parsers[key] = SelectorParser(selectors, backend)
+            logger.debug(f"Compiled {len(selectors)} selectors for {source} ({_parsers[key].backend.name})")
+        return _parsers[key]
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Per-Source Token Bucket Rate Limiting
+
+Each job source gets its own bucket so that a slow, strictly limited site does not
+throttle requests to unrelated sources. Buckets are shared process-wide, so concurrent
+scrapes of the same source still respect a single limit.
+"""
+
+from loguru import logger
+import random
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at a fixed rate up to a burst capacity"""
+
+    def __init__(self, rate, capacity=1, jitter=0.0):
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self.jitter = jitter
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self.updated
+        if self.rate == float('inf'):
+            self.tokens = self.capacity
+        else:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a token is available and return the seconds spent waiting"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Take the token now, possibly going negative, and sleep off the debt outside the lock
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 and self.rate > 0 else 0.0
+
+        if self.jitter:
+            wait += random.uniform(0, self.jitter)
+
+        if wait > 0:
+            time.sleep(wait)
+
+        return wait
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_rate_limiter(source, source_config=None):
+    """Return the shared bucket for a source, created from `sources.<name>` config"""
+    with _buckets_lock:
+        if source not in _buckets:
+            source_config = source_config or {}
+            # rate_limit is the average number of seconds between requests
+            interval = source_config.get('rate_limit', 2)
+            rate = 1.0 / interval if interval else float('inf')
+            capacity = source_config.get('burst', source_config.get('concurrency', 1))
+            jitter = source_config.get('rate_jitter', 0.5)
+            _buckets[source] = TokenBucket(rate, capacity, jitter)
+            logger.debug(f"Created rate limiter for {source}: {rate:.2f} req/s, burst {capacity}")
+        return _buckets[source]
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Offline Record/Replay of Job Source Pages
+
+Recorded pages are stored as HTML fixtures with an index keyed by URL path, and a local
+stand-in HTTP server replays them with configurable latency. Point a source's `base_url`
+at the server to scrape (or benchmark) without touching the live site. Synthetic
+pracuj.pl-style fixtures can be generated when no recording is available.
+
+Usage:
+    python replay.py generate fixtures/ --pages 10 --offers 50
+    python replay.py serve fixtures/ --port 8765 --latency 0.2
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+from datetime import datetime
+from loguru import logger
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from fetcher import BaseFetcher
+from sources import PracujSource
+
+INDEX_FILE = 'index.json'
+
+
+def fixture_key(url):
+    """Index key of a URL: its decoded path, query and fragment, without scheme and host
+
+    Fragments are never sent to a server, so they label extra captures of one URL such as
+    the steps of a login flow (`/#login-password`).
+    """
+    parts = urlsplit(url)
+    key = unquote(parts.path) or '/'
+    if parts.query:
+        key += '?' + unquote(parts.query)
+    if parts.fragment:
+        key += '#' + parts.fragment
+    return key
+
+
+class FixtureStore:
+    """Directory of HTML fixtures plus an index.json mapping URL paths to files"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self._lock = threading.Lock()
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+
+    def save(self, url, html, status=200, source=None, kind='listing'):
+        """Store a page, replacing any earlier recording of the same path"""
+        key = fixture_key(url)
+        with self._lock:
+            entry = self.index.get(key) or {'file': os.path.join('pages', f"{len(self.index) + 1:05d}.html")}
+            entry.update({
+                'url': url,
+                'status': status,
+                'source': source,
+                'kind': kind,
+                'recorded': datetime.now().isoformat()
+            })
+            self.index[key] = entry
+
+            path = os.path.join(self.directory, entry['file'])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(html)
+            with open(self.index_path, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f, ensure_ascii=False, indent=2)
+
+    def load(self, url):
+        """Return (status, html) recorded for a URL or path, or None"""
+        entry = self.index.get(fixture_key(url))
+        if not entry:
+            return None
+        with open(os.path.join(self.directory, entry['file']), 'r', encoding='utf-8') as f:
+            return entry.get('status', 200), f.read()
+
+    def pages(self, kind='listing'):
+        """Yield (key, html) for every recorded page of a kind"""
+        for key in sorted(self.index):
+            if self.index[key].get('kind') == kind:
+                yield key, self.load(key)[1]
+
+    def __len__(self):
+        return len(self.index)
+
+
+class RecordingFetcher(BaseFetcher):
+    """Wraps a fetcher and saves every page it returns as a fixture"""
+
+    def __init__(self, inner, store, source=None):
+        super().__init__()
+        self.inner = inner
+        self.store = store
+        self.source = source
+
+    @property
+    def via(self):
+        return self.inner.via
+
+    def __getattr__(self, name):
+        # Expose the wrapped fetcher's parts (e.g. `primary` for session sharing)
+        if name == 'inner':
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    def fetch(self, url, ready_selector=None):
+        result = self.inner.fetch(url, ready_selector)
+        try:
+            self.store.save(result.url, result.html, result.status or 200, self.source)
+        except Exception as e:
+            logger.warning(f"Could not record {result.url}: {str(e)}")
+        return result
+
+    def close(self):
+        self.inner.close()
+
+
+class ReplayServer:
+    """Threaded local HTTP server replaying fixtures with artificial latency"""
+
+    def __init__(self, store, host='127.0.0.1', port=0, latency=0.0, jitter=0.0):
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+        self._thread = None
+
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                replay.requests += 1
+                delay = replay.latency + (random.uniform(0, replay.jitter) if replay.jitter else 0)
+                if delay > 0:
+                    time.sleep(delay)
+
+                # A login page is served from the first capture of its flow
+                recorded = replay.store.load(self.path) or replay.store.load(self.path + '#login')
+                status, html = recorded if recorded else (404, '<html><body>Not recorded</body></html>')
+                body = html.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"Replay {self.address_string()} - {format % args}")
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve in a background thread and return the base URL"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='replay-server', daemon=True)
+        self._thread.start()
+        logger.info(f"Replaying {len(self.store)} fixtures at {self.base_url} (latency {self.latency}s)")
+        return self.base_url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+# Vocabulary for synthetic pracuj.pl-style listings
+TITLE_LEVELS = ['Junior', 'Mid', 'Senior', 'Lead', 'Principal', '']
+TITLE_ROLES = ['Python Developer', 'Backend Engineer', 'Software Engineer', 'Data Engineer',
+               'Java Developer', 'DevOps Engineer', 'Frontend Developer', 'Python Engineer']
+COMPANY_SYLLABLES = ['ac', 'me', 'glo', 'bex', 'ini', 'tech', 'um', 'bre', 'hoo', 'li', 'soy', 'lent',
+                     'van', 'de', 'lay', 'stark', 'cy', 'ber', 'dyne', 'ty', 'rell', 'aper', 'ture', 'zo']
+LOCATIONS = ['Warszawa', 'Kraków', 'Wrocław', 'Gdańsk', 'Poznań', 'Łódź', 'Zdalna']
+TECHNOLOGIES = ['Python', 'Django', 'Flask', 'FastAPI', 'PostgreSQL', 'Docker', 'Kubernetes',
+                'AWS', 'Java', 'Spring', 'React', 'TypeScript', 'Redis', 'Kafka', 'Go']
+
+
+def synthetic_offers(count, seed=0, duplicate_rate=0.1):
+    """Generate offer dicts; about `duplicate_rate` of them are reworded copies of earlier ones"""
+    rng = random.Random(seed)
+    offers = []
+    for i in range(count):
+        if offers and rng.random() < duplicate_rate:
+            original = rng.choice(offers)
+            offer = dict(original, title=original['title'] + ' (m/f)', link=f"/oferta/{i}")
+        else:
+            title = f"{rng.choice(TITLE_LEVELS)} {rng.choice(TITLE_ROLES)}".strip()
+            offer = {
+                'title': title,
+                'company': ''.join(rng.choice(COMPANY_SYLLABLES) for _ in range(3)).title() + ' '
+                           + rng.choice(['Sp. z o.o.', 'S.A.', 'Labs', 'Software']),
+                'location': rng.choice(LOCATIONS),
+                'technologies': rng.sample(TECHNOLOGIES, rng.randint(2, 6)),
+                'link': f"/oferta/{i}"
+            }
+        offers.append(offer)
+    return offers
+
+
+def render_listing_page(offers, has_next, padding_kb=0):
+    """Render offers as a listing page matching the default pracuj.pl selectors"""
+    items = []
+    for offer in offers:
+        technologies = ''.join(f'<span data-test="technologies-item">{t}</span>' for t in offer['technologies'])
+        items.append(
+            '<div data-test="default-offer">'
+            f'<a data-test="link-offer" href="{offer["link"]}"><h2 data-test="offer-title">{offer["title"]}</h2></a>'
+            f'<h3 data-test="text-company-name">{offer["company"]}</h3>'
+            f'<h4 data-test="text-region">{offer["location"]}</h4>'
+            f'<div>{technologies}</div>'
+            '</div>'
+        )
+    next_button = '<button data-test="bottom-pagination-button-next">Next</button>' if has_next else ''
+    # Real listing pages carry a lot of inline script and markup around the offers
+    padding = f'<script>var state = "{"x" * padding_kb * 1024}";</script>' if padding_kb else ''
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Oferty pracy</title>'
+        f'{padding}</head><body><div data-test="section-offers">{"".join(items)}</div>'
+        f'{next_button}</body></html>'
+    )
+
+
+def generate_fixtures(directory, keywords='python engineer', pages=10, offers_per_page=50,
+                      padding_kb=100, seed=0, source_config=None):
+    """Write synthetic listing pages for one search into a fixture store"""
+    store = FixtureStore(directory)
+    plugin = PracujSource('pracuj', source_config)
+    offers = synthetic_offers(pages * offers_per_page, seed)
+
+    for page in range(1, pages + 1):
+        page_offers = offers[(page - 1) * offers_per_page:page * offers_per_page]
+        html = render_listing_page(page_offers, has_next=page < pages, padding_kb=padding_kb)
+        store.save(plugin.search_url(keywords, page), html, source='pracuj')
+
+    logger.info(f"Generated {pages} synthetic pages ({len(offers)} offers) in {directory}")
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record/replay fixtures for offline scraping")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate = commands.add_parser('generate', help="write synthetic pracuj.pl-style fixtures")
+    generate.add_argument('directory')
+    generate.add_argument('--keywords', default='python engineer')
+    generate.add_argument('--pages', type=int, default=10)
+    generate.add_argument('--offers', type=int, default=50, help="offers per page")
+    generate.add_argument('--padding-kb', type=int, default=100, help="filler per page to mimic real page size")
+    generate.add_argument('--seed', type=int, default=0)
+
+    serve = commands.add_parser('serve', help="replay fixtures over HTTP")
+    serve.add_argument('directory')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    serve.add_argument('--jitter', type=float, default=0.0, help="extra random latency up to this many seconds")
+
+    args = parser.parse_args()
+
+    if args.command == 'generate':
+        generate_fixtures(args.directory, args.keywords, args.pages, args.offers, args.padding_kb, args.seed)
+    else:
+        server = ReplayServer(FixtureStore(args.directory), args.host, args.port, args.latency, args.jitter)
+        server.start()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Batched Job Scoring and Filtering
+
+Keyword, technology, location and exclusion vocabularies from the `processing` config
+are compiled once into single alternation regexes. Jobs are then matched in batches and
+their weighted scores and filter masks are computed with numpy.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from loguru import logger
+import numpy as np
+import re
+
+DEFAULT_TITLE_KEYWORDS = ['python', 'backend', 'engineer', 'developer', 'senior']
+DEFAULT_TECHNOLOGIES = ['python', 'django', 'flask', 'fastapi', 'postgresql', 'docker', 'kubernetes']
+DEFAULT_WEIGHTS = {
+    'title_match': 0.3,
+    'technology_match': 0.4,
+    'location_preference': 0.2,
+    'freshness': 0.1
+}
+
+
+def compile_vocabulary(words):
+    """Compile a word list into one alternation regex matching whole words only, or None if empty
+
+    Patterns are matched against lowercased text. Lookarounds stand in for `\\b` so that
+    terms ending in symbols (`c++`, `.net`) still match, while `go` no longer matches
+    "django" and `intern` no longer matches "international".
+    """
+    words = sorted({w.lower() for w in words if w}, key=len, reverse=True)
+    if not words:
+        return None
+    return re.compile(r'(?<!\w)(?:' + '|'.join(re.escape(w) for w in words) + r')(?!\w)')
+
+
+class ScoringEngine:
+    """Scores and filters jobs according to `processing.score_weights` and `processing.filters`"""
+
+    def __init__(self, processing_config=None):
+        processing_config = processing_config or {}
+        filters = processing_config.get('filters', {})
+
+        weights = dict(DEFAULT_WEIGHTS)
+        weights.update(processing_config.get('score_weights', {}))
+        self.weights = np.array([
+            weights['title_match'],
+            weights['technology_match'],
+            weights['location_preference'],
+            weights['freshness']
+        ], dtype=float)
+        total = self.weights.sum()
+        self.weights = self.weights / total if total else self.weights
+
+        self.base_score = processing_config.get('base_score', 0.5)
+        self.title_saturation = processing_config.get('title_saturation', 4)
+        self.technology_saturation = processing_config.get('technology_saturation', 3)
+        self.freshness_window = processing_config.get('freshness_hours', 24) * 3600
+
+        self.title_regex = compile_vocabulary(processing_config.get('title_keywords', DEFAULT_TITLE_KEYWORDS))
+        self.technology_regex = compile_vocabulary(processing_config.get('relevant_technologies', DEFAULT_TECHNOLOGIES))
+        self.location_regex = compile_vocabulary(processing_config.get('preferred_locations', []))
+        self.exclude_regex = compile_vocabulary(filters.get('exclude_keywords', []))
+        self.required_technologies = [compile_vocabulary([t]) for t in filters.get('required_technologies', []) if t]
+        self.min_score = filters.get('min_score', 0)
+
+        # Titles, technologies and locations repeat heavily across jobs, so memoize the regex work
+        self._title_hits = lru_cache(maxsize=65536)(self._count_title_hits)
+        self._technology_hit = lru_cache(maxsize=65536)(self._is_relevant_technology)
+        self._location_hit = lru_cache(maxsize=4096)(self._is_preferred_location)
+
+    def _count_title_hits(self, title):
+        return len(set(self.title_regex.findall(title.lower()))) if self.title_regex else 0
+
+    def _is_relevant_technology(self, tech):
+        return bool(self.technology_regex and self.technology_regex.search(tech.lower()))
+
+    def _is_preferred_location(self, location):
+        return bool(self.location_regex and self.location_regex.search(location.lower()))
+
+    def _components(self, jobs, now):
+        """Return an (n, 4) array of title, technology, location and freshness components in [0, 1]"""
+        title_hits, technology_hit, location_hit = self._title_hits, self._technology_hit, self._location_hit
+        raw = np.array([
+            (
+                title_hits(job.get('title') or ''),
+                sum(map(technology_hit, job.get('technologies', []))),
+                location_hit(job.get('location') or '')
+            )
+            for job in jobs
+        ], dtype=float).reshape(len(jobs), 3)
+
+        components = np.empty((len(jobs), 4), dtype=float)
+        components[:, 0] = np.minimum(raw[:, 0] / self.title_saturation, 1.0)
+        components[:, 1] = np.minimum(raw[:, 1] / self.technology_saturation, 1.0)
+        # Without a location preference every location is equally acceptable
+        components[:, 2] = raw[:, 2] if self.location_regex else 0.5
+
+        # Listings carry no posting date, so freshness is the time since the job was extracted
+        if self.freshness_window:
+            delta = np.datetime64(now, 's') - self._extracted_times(jobs)
+            age = np.where(np.isnat(delta), 0.0, delta.astype(float))
+            components[:, 3] = np.clip(1.0 - age / self.freshness_window, 0.0, 1.0)
+        else:
+            components[:, 3] = 1.0
+
+        return components
+
+    @staticmethod
+    def _extracted_times(jobs):
+        """Extraction times as datetime64 seconds, NaT where unknown or invalid"""
+        values = [job.get('extracted') or '' for job in jobs]
+        try:
+            return np.array([v or 'NaT' for v in values], dtype='datetime64[s]')
+        except ValueError:
+            times = []
+            for value in values:
+                try:
+                    times.append(np.datetime64(datetime.fromisoformat(value), 's'))
+                except (TypeError, ValueError):
+                    times.append(np.datetime64('NaT'))
+            return np.array(times, dtype='datetime64[s]')
+
+    def match_batch(self, jobs, now=None):
+        """Return an array of weighted component sums (0.0 to 1.0), the match before base_score"""
+        if not jobs:
+            return np.zeros(0)
+        return self._components(jobs, now or datetime.now()) @ self.weights
+
+    def score_batch(self, jobs, now=None):
+        """Return an array of scores (base_score to 1.0) for a batch of jobs"""
+        return self._to_scores(self.match_batch(jobs, now))
+
+    def _to_scores(self, match):
+        return self.base_score + (1.0 - self.base_score) * match
+
+    def _keep_mask(self, jobs, match):
+        # min_score applies to the match itself, so it filters regardless of base_score
+        keep = match >= self.min_score
+
+        if self.exclude_regex:
+            search = self.exclude_regex.search
+            excluded = np.fromiter(
+                (search((job.get('title') or '').lower()) is not None for job in jobs),
+                dtype=bool, count=len(jobs)
+            )
+            keep &= ~excluded
+
+        if self.required_technologies:
+            has_required = np.fromiter(
+                (all(any(req.search(tech.lower()) for tech in job.get('technologies', []))
+                     for req in self.required_technologies) for job in jobs),
+                dtype=bool, count=len(jobs)
+            )
+            keep &= has_required
+
+        return keep
+
+    def apply(self, jobs, now=None):
+        """Rescore jobs in place and return those passing the filters, highest score first"""
+        if not jobs:
+            return []
+
+        match = self.match_batch(jobs, now)
+        scores = self._to_scores(match)
+        keep = self._keep_mask(jobs, match)
+        order = np.argsort(-scores, kind='stable')
+
+        result = []
+        for i in order:
+            jobs[i]['score'] = round(float(scores[i]), 4)
+            if keep[i]:
+                result.append(jobs[i])
+
+        logger.debug(f"Scored {len(jobs)} jobs, {len(result)} passed filters")
+        return result
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Background Scrape Queue
+
+Runs scrape requests on a bounded pool of worker threads so API requests can enqueue a
+scrape and return immediately. Each task keeps its status, progress and results in
+memory until it expires.
+"""
+
+from loguru import logger
+from datetime import datetime
+import queue
+import threading
+import time
+import uuid
+
+
+class QueueFullError(Exception):
+    """Raised when the scrape queue has no room for another task"""
+    pass
+
+
+class ScrapeTask:
+    """A queued scrape and everything known about its progress"""
+
+    def __init__(self, params):
+        self.id = uuid.uuid4().hex[:12]
+        self.params = params
+        self.status = 'queued'
+        self.pages_done = 0
+        self.jobs_found = 0
+        self.results = None
+        self.partial = False
+        self.cursor = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+
+    def report_progress(self, pages_done, jobs_found):
+        """Progress callback handed to the scraper"""
+        self.pages_done = pages_done
+        self.jobs_found = jobs_found
+
+    def to_dict(self, include_results=True):
+        data = {
+            'id': self.id,
+            'status': self.status,
+            'params': self.params,
+            'progress': {
+                'pages_done': self.pages_done,
+                'jobs_found': self.jobs_found
+            },
+            'created': datetime.fromtimestamp(self.created).isoformat(),
+            'started': datetime.fromtimestamp(self.started).isoformat() if self.started else None,
+            'finished': datetime.fromtimestamp(self.finished).isoformat() if self.finished else None
+        }
+        if self.error:
+            data['error'] = self.error
+        if include_results and self.results is not None:
+            data['jobs'] = self.results
+            data['total_count'] = len(self.results)
+            data['partial'] = self.partial
+        if self.cursor is not None:
+            data['cursor'] = self.cursor
+        return data
+
+
+class ScrapeQueue:
+    """Bounded task queue drained by a fixed number of worker threads
+
+    `runner(params, progress_callback)` scrapes one task and returns (jobs, partial, cursor),
+    where `cursor` is the delta feed position to poll from next (None without one).
+    """
+
+    def __init__(self, runner, workers=2, max_queued=20, result_ttl=3600):
+        self.runner = runner
+        self.workers = max(1, int(workers))
+        self.result_ttl = result_ttl
+        self._queue = queue.Queue(maxsize=max(1, int(max_queued)))
+        self._tasks = {}
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def start(self):
+        """Start the worker threads (idempotent)"""
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"scrape-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        logger.info(f"Scrape queue started with {self.workers} worker(s)")
+
+    def _work(self):
+        while True:
+            task = self._queue.get()
+            task.status = 'running'
+            task.started = time.time()
+            try:
+                task.results, task.partial, task.cursor = self.runner(task.params, task.report_progress)
+                task.jobs_found = len(task.results)
+                task.status = 'completed'
+            except Exception as e:
+                logger.error(f"Scrape task {task.id} failed: {str(e)}")
+                task.error = str(e)
+                task.status = 'failed'
+            finally:
+                task.finished = time.time()
+                self._queue.task_done()
+
+    def _expire(self):
+        """Drop finished tasks older than the result TTL"""
+        cutoff = time.time() - self.result_ttl
+        with self._lock:
+            expired = [task_id for task_id, task in self._tasks.items()
+                       if task.finished and task.finished < cutoff]
+            for task_id in expired:
+                del self._tasks[task_id]
+
+    def submit(self, params):
+        """Queue a scrape and return its task; raises QueueFullError when saturated"""
+        self.start()
+        self._expire()
+
+        task = ScrapeTask(params)
+        with self._lock:
+            self._tasks[task.id] = task
+
+        try:
+            self._queue.put_nowait(task)
+        except queue.Full:
+            with self._lock:
+                del self._tasks[task.id]
+            raise QueueFullError(f"Scrape queue is full ({self._queue.maxsize} tasks waiting)")
+
+        logger.info(f"Queued scrape task {task.id}: {params}")
+        return task
+
+    def get(self, task_id):
+        """Return a task by id, or None if unknown or expired"""
+        self._expire()
+        with self._lock:
+            return self._tasks.get(task_id)
+
+    def stats(self):
+        """Return a snapshot of queue occupancy"""
+        with self._lock:
+            running = sum(1 for task in self._tasks.values() if task.status == 'running')
+        return {
+            'workers': self.workers,
+            'queued': self._queue.qsize(),
+            'running': running,
+            'max_queued': self._queue.maxsize
+        }
@@ -12,22 +12,71 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException
 from loguru import logger
-from datetime import datetime, timedelta
+from datetime import datetime
+from urllib.parse import urlsplit
 import json
 import os
-import time
 import yaml
 import hashlib
-import random
-from ratelimit import limits, sleep_and_retry
+import uuid
 from dotenv import load_dotenv
+from driver_pool import get_driver_pool
+from fetcher import FallbackFetcher, HttpFetcher, SeleniumFetcher
+from rate_limiter import get_rate_limiter
+from job_store import get_job_store
+from dedup import NearDuplicateIndex, deduplicate, get_repost_index
+from scoring import ScoringEngine
+from sources import get_source, registered_sources
+from orchestrator import ScrapeOrchestrator, plan_tasks
+from replay import FixtureStore, RecordingFetcher
+from metrics import (DRIVER_RESTARTS, FETCH_RETRIES, JOBS_DROPPED, JOBS_PARSED, PAGE_FAILURES, PAGES_FETCHED,
+                     RATE_LIMIT_WAIT, SEARCH_RESUMES, span, stage)
+from concurrent.futures import ThreadPoolExecutor
 
 # Load environment variables
 load_dotenv()
 
+# URL patterns blocked through CDP for each resource type in lean mode
+RESOURCE_TYPE_PATTERNS = {
+    'Image': ['*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.svg*', '*.ico*', '*.avif*'],
+    'Font': ['*.woff*', '*.ttf*', '*.otf*', '*.eot*'],
+    'Stylesheet': ['*.css*'],
+    'Media': ['*.mp4*', '*.webm*', '*.mp3*', '*.m3u8*']
+}
+
+# Cookie consent buttons, checked together as one XPath union
+CONSENT_BUTTON_XPATHS = [
+    "//button[contains(text(), 'Akceptuj wszystkie')]",
+    "//button[contains(text(), 'Accept all')]",
+    "//button[contains(text(), 'Accept All')]",
+    "//button[@id='onetrust-accept-btn-handler']",
+    "//button[contains(@class, 'cookie-accept')]"
+]
+
+# config.yaml sits next to the code in the Docker image (/app/config) and one level up in a checkout
+CONFIG_PATHS = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config', 'config.yaml'),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'config', 'config.yaml')
+]
+
+def find_config_file():
+    """Return the path of the project's config.yaml, or None if there is none"""
+    for path in CONFIG_PATHS:
+        if os.path.exists(path):
+            return os.path.normpath(path)
+    return None
+
+def merge_config(base, override):
+    """Recursively merge an override config dict into a base config dict"""
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            merge_config(base[key], value)
+        else:
+            base[key] = value
+    return base
+
 class ScrapingError(Exception):
     """Custom exception for scraping-related errors"""
     pass
@@ -35,10 +84,22 @@ class ScrapingError(Exception):
 class JobScraper:
     """Enhanced job scraper with multi-source support and robust error handling"""
     
-    def __init__(self, config=None):
+    def __init__(self, config=None, driver_pool=None, job_store=None, progress_callback=None, timings=None):
         """Initialize the job scraper with configuration"""
         self.config = config or self._load_default_config()
         self.drivers = {}
+        self.driver_pool = driver_pool
+        self.job_store = job_store
+        self.progress_callback = progress_callback
+        self.timings = timings
+        self.pages_done = 0
+        self.jobs_found = 0
+        self.partial = False
+        self.parsed_ids = set()
+        self.scoring = ScoringEngine(self.config.get('processing', {}))
+        self._leases = {}
+        self.logged_in = set()
+        self.fetchers = {}
         self.scraped_jobs = []
         
         # Setup Chrome options
@@ -51,13 +112,41 @@ class JobScraper:
         logger.info("JobScraper initialized with enhanced configuration")
     
     def _load_default_config(self):
-        """Load default configuration if none provided"""
-        return {
+        """Load default configuration if none provided
+        
+        The project's config/config.yaml is merged over the built-in defaults, and a YAML
+        file named by the SCRAPER_CONFIG environment variable is merged on top of that,
+        e.g. to point sources at a local replay server.
+        """
+        config = {
             'chrome': {
                 'headless': True,
                 'timeout': 30,
                 'page_load_timeout': 30,
                 'implicit_wait': 10,
+                'lean': {
+                    'enabled': True,
+                    'page_load_strategy': 'eager',
+                    'blocked_resource_types': ['Image', 'Font', 'Stylesheet', 'Media'],
+                    'blocked_domains': [
+                        '*google-analytics.com*',
+                        '*googletagmanager.com*',
+                        '*doubleclick.net*',
+                        '*facebook.net*',
+                        '*hotjar.com*'
+                    ]
+                },
+                'consent_wait': 3,
+                'consent_cookies': ['OptanonAlertBoxClosed'],
+                'max_driver_restarts': 2,
+                'pool': {
+                    'size': 2,
+                    'max_pages_per_driver': 50,
+                    'max_memory_mb': 1024,
+                    'session_dir': 'data/sessions',
+                    'session_max_age': 43200,
+                    'session_check_interval': 300
+                },
                 'options': [
                     '--no-sandbox',
                     '--disable-dev-shm-usage',
@@ -69,11 +158,57 @@ class JobScraper:
             'sources': {
                 'pracuj': {
                     'enabled': True,
+                    'base_url': 'https://it.pracuj.pl',
+                    'search_path': '/praca/{keywords};kw/ostatnich%2024h;p,{page}/polska;ct,1',
                     'rate_limit': 2,
-                    'max_pages': 10
+                    'burst': 3,
+                    'concurrency': 3,
+                    'max_pages': 10,
+                    'parser': 'auto',
+                    'fetch': {
+                        'mode': 'http',
+                        'timeout': 15,
+                        'pool_size': 10,
+                        'browser_wait': 20
+                    }
                 }
+            },
+            'processing': {
+                'score_weights': {
+                    'title_match': 0.3,
+                    'technology_match': 0.4,
+                    'location_preference': 0.2,
+                    'freshness': 0.1
+                },
+                'filters': {
+                    'min_score': 0.4,
+                    'exclude_keywords': ['intern', 'praktyki', 'stażysta'],
+                    'required_technologies': []
+                }
+            },
+            'search': {
+                'default_keywords': ['python engineer'],
+                'parallel_tasks': 4,
+                'deduplication_threshold': 0.8,
+                'dedup_window_hours': 72,
+                'resume_attempts': 2,
+                'checkpoint_max_age': 3600,
+                'checkpoint_live_timeout': 300
+            },
+            'database': {
+                'type': 'sqlite',
+                'path': 'data/jobs.db',
+                'incremental': False
             }
         }
+        
+        for override_path in (find_config_file(), os.getenv('SCRAPER_CONFIG')):
+            if override_path:
+                with open(override_path, 'r') as file:
+                    merge_config(config, yaml.safe_load(file) or {})
+                logger.debug(f"Merged scraper configuration from {override_path}")
+        
+        return config
     
     def _setup_chrome_options(self):
         """Setup Chrome options with enhanced configuration"""
@@ -88,6 +223,13 @@ class JobScraper:
         window_size = chrome_config.get('window_size', '1920,1080')
         options.add_argument(f'--window-size={window_size}')
         
+        # Lean mode: hand control back once the DOM is ready and skip image decoding entirely
+        lean_config = chrome_config.get('lean', {})
+        if lean_config.get('enabled', False):
+            options.page_load_strategy = lean_config.get('page_load_strategy', 'eager')
+            if 'Image' in lean_config.get('blocked_resource_types', []):
+                options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        
         # Enhanced Chrome options for stability
         default_options = [
             '--no-sandbox',
@@ -119,28 +261,63 @@ class JobScraper:
         
         return options
     
+    @stage('driver_start')
+    def _create_driver(self):
+        """Start a new Chrome WebDriver with the configured options and timeouts"""
+        # Try to use system ChromeDriver first
+        chromedriver_path = os.environ.get('CHROMEDRIVER_PATH', '/usr/bin/chromedriver')
+        
+        if os.path.exists(chromedriver_path):
+            service = ChromeService(executable_path=chromedriver_path)
+        else:
+            # Fallback to default (assumes ChromeDriver is in PATH)
+            service = ChromeService()
+        
+        driver = webdriver.Chrome(service=service, options=self.chrome_options)
+        
+        # Configure timeouts
+        chrome_config = self.config.get('chrome', {})
+        lean_config = chrome_config.get('lean', {})
+        driver.set_page_load_timeout(chrome_config.get('page_load_timeout', 30))
+        
+        if lean_config.get('enabled', False):
+            # Every lookup uses an explicit, targeted wait instead of an implicit one
+            driver.implicitly_wait(0)
+            self._block_resources(driver, lean_config)
+        else:
+            driver.implicitly_wait(chrome_config.get('implicit_wait', 10))
+        
+        return driver
+    
+    def _block_resources(self, driver, lean_config):
+        """Block non-essential resource types and tracker domains through CDP"""
+        patterns = list(lean_config.get('blocked_domains', []))
+        for resource_type in lean_config.get('blocked_resource_types', []):
+            patterns.extend(RESOURCE_TYPE_PATTERNS.get(resource_type, []))
+        
+        if not patterns:
+            return
+        
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+            logger.debug(f"Blocking {len(patterns)} URL patterns in lean mode")
+        except Exception as e:
+            logger.warning(f"Could not enable resource blocking: {str(e)}")
+    
     def _get_driver(self, source='default'):
         """Get or create a WebDriver instance for a specific source"""
         if source not in self.drivers:
             try:
-                # Try to use system ChromeDriver first
-                chromedriver_path = os.environ.get('CHROMEDRIVER_PATH', '/usr/bin/chromedriver')
-                
-                if os.path.exists(chromedriver_path):
-                    service = ChromeService(executable_path=chromedriver_path)
+                if self.driver_pool:
+                    with self._span('driver_acquire', source):
+                        lease = self.driver_pool.acquire(self._create_driver)
+                    self._leases[source] = lease
+                    self.drivers[source] = lease.driver
+                    logger.info(f"Leased pooled WebDriver for source: {source}")
                 else:
-                    # Fallback to default (assumes ChromeDriver is in PATH)
-                    service = ChromeService()
-                
-                driver = webdriver.Chrome(service=service, options=self.chrome_options)
-                
-                # Configure timeouts
-                chrome_config = self.config.get('chrome', {})
-                driver.set_page_load_timeout(chrome_config.get('page_load_timeout', 30))
-                driver.implicitly_wait(chrome_config.get('implicit_wait', 10))
-                
-                self.drivers[source] = driver
-                logger.info(f"Created WebDriver for source: {source}")
+                    self.drivers[source] = self._create_driver()
+                    logger.info(f"Created WebDriver for source: {source}")
                 
             except Exception as e:
                 logger.error(f"Failed to create WebDriver for {source}: {str(e)}")
@@ -148,75 +325,182 @@ class JobScraper:
         
         return self.drivers[source]
     
+    def _get_browser(self, source):
+        """Get the source's WebDriver for a page fetch, logging a newly acquired one in first
+        
+        In HTTP mode the browser that logged in is released, so a fallback fetch can get a
+        different pooled driver; it is brought into the search's logged-in state here.
+        """
+        acquired = source not in self.drivers
+        driver = self._get_driver(source)
+        if acquired and source in self.logged_in:
+            try:
+                self._get_source(source).prepare_browser(self, driver)
+            except Exception as e:
+                logger.warning(f"Could not log in browser for {source}: {str(e)}")
+        return driver
+    
     def _close_drivers(self):
-        """Close all WebDriver instances"""
+        """Close all WebDriver instances, returning pooled ones to the pool"""
         for source, driver in self.drivers.items():
+            lease = self._leases.pop(source, None)
             try:
-                driver.quit()
-                logger.info(f"Closed WebDriver for source: {source}")
+                if lease:
+                    self.driver_pool.release(lease)
+                    logger.info(f"Released pooled WebDriver for source: {source}")
+                else:
+                    driver.quit()
+                    logger.info(f"Closed WebDriver for source: {source}")
             except Exception as e:
                 logger.warning(f"Error closing WebDriver for {source}: {str(e)}")
         
         self.drivers.clear()
     
-    @sleep_and_retry
-    @limits(calls=30, period=60)  # Global rate limit: 30 calls per minute
-    def _rate_limited_request(self, driver, url, source='default'):
-        """Make a rate-limited request to avoid overwhelming servers"""
+    def _throttle(self, source='default'):
+        """Wait for the source's token bucket before the next request to avoid overwhelming servers"""
         source_config = self.config.get('sources', {}).get(source, {})
-        rate_limit = source_config.get('rate_limit', 2)
-        
-        # Add random delay to avoid detection
-        delay = rate_limit + random.uniform(0.5, 1.5)
-        time.sleep(delay)
+        waited = get_rate_limiter(source, source_config).acquire()
+        if waited:
+            RATE_LIMIT_WAIT.inc(waited, source=source)
+            if self.timings is not None:
+                self.timings.add('rate_limit', waited)
+            logger.debug(f"Rate limiter for {source} waited {waited:.2f}s")
+        return waited
+    
+    def _get_fetcher(self, source):
+        """Get or create the page fetcher for a source (HTTP first, browser as fallback)"""
+        if source not in self.fetchers:
+            source_config = self.config.get('sources', {}).get(source, {})
+            fetch_config = source_config.get('fetch', {})
+            base_url = source_config.get('base_url', '')
+            
+            browser = SeleniumFetcher(
+                lambda: self._get_browser(source),
+                base_url,
+                wait_timeout=fetch_config.get('browser_wait', 20)
+            )
+            
+            if fetch_config.get('mode', 'http') == 'selenium':
+                fetcher = browser
+            else:
+                http = HttpFetcher(
+                    base_url,
+                    timeout=fetch_config.get('timeout', 15),
+                    pool_size=fetch_config.get('pool_size', 10)
+                )
+                fetcher = FallbackFetcher(
+                    http, browser,
+                    content_check=self._get_parser(source).has_offers_section
+                )
+            
+            fixtures = self._fixture_store(source)
+            if fixtures is not None:
+                fetcher = RecordingFetcher(fetcher, fixtures, source)
+                logger.info(f"Recording {source} pages to {fixtures.directory}")
+            
+            self.fetchers[source] = fetcher
+            logger.info(f"Created {fetcher.via} fetcher for source: {source}")
         
+        return self.fetchers[source]
+    
+    def _fixture_store(self, source):
+        """Fixture store pages are recorded to (RECORD_FIXTURES_DIR or fetch.record_dir), if any"""
+        fetch_config = self.config.get('sources', {}).get(source, {}).get('fetch', {})
+        record_dir = os.getenv('RECORD_FIXTURES_DIR', fetch_config.get('record_dir'))
+        return FixtureStore(os.path.join(record_dir, source)) if record_dir else None
+    
+    def _record_page(self, driver, source, step):
+        """Save the browser's current page as a fixture when recording is enabled"""
+        fixtures = self._fixture_store(source)
+        if fixtures is None:
+            return
         try:
-            driver.get(url)
-            logger.debug(f"Successfully loaded URL: {url}")
+            fixtures.save(f"{driver.current_url.split('#')[0]}#{step}", driver.page_source, source=source, kind=step)
         except Exception as e:
-            logger.error(f"Failed to load URL {url}: {str(e)}")
-            raise ScrapingError(f"Failed to load page: {str(e)}")
+            logger.debug(f"Could not record {step} page: {str(e)}")
+    
+    def _fetch_page(self, source, url, ready_selector=None):
+        """Fetch a page through the source's fetcher, honouring the rate limit"""
+        self._throttle(source)
+        with self._span('fetch', source):
+            result = self._get_fetcher(source).fetch(url, ready_selector)
+        
+        PAGES_FETCHED.inc(source=source, via=result.via)
+        fetch_mode = self.config.get('sources', {}).get(source, {}).get('fetch', {}).get('mode', 'http')
+        if result.via == 'selenium' and fetch_mode != 'selenium':
+            FETCH_RETRIES.inc(source=source)
+        
+        lease = self._leases.get(source)
+        if lease and result.via == 'selenium':
+            lease.record_page()
+        
+        logger.debug(f"Loaded URL via {result.via}: {result.url}")
+        return result
     
     def test_chrome_availability(self):
         """Test if Chrome/ChromeDriver is available"""
         try:
             driver = self._get_driver('test')
             driver.get('about:blank')
-            driver.quit()
             return True
         except Exception as e:
             logger.error(f"Chrome availability test failed: {str(e)}")
             return False
+        finally:
+            self._release_driver('test')
+    
+    def _release_driver(self, source):
+        """Release or quit the WebDriver held for a single source"""
+        driver = self.drivers.pop(source, None)
+        lease = self._leases.pop(source, None)
+        try:
+            if lease:
+                self.driver_pool.release(lease)
+            elif driver:
+                driver.quit()
+        except Exception as e:
+            logger.warning(f"Error closing WebDriver for {source}: {str(e)}")
     
+    @stage('consent')
     def _accept_cookies(self, driver):
-        """Accept cookie consent if present"""
-        try:
-            # Common cookie acceptance patterns
-            cookie_selectors = [
-                "//button[contains(text(), 'Akceptuj wszystkie')]",
-                "//button[contains(text(), 'Accept all')]",
-                "//button[contains(text(), 'Accept All')]",
-                "//button[@id='onetrust-accept-btn-handler']",
-                "//button[contains(@class, 'cookie-accept')]"
-            ]
-            
-            for selector in cookie_selectors:
-                try:
-                    cookie_button = WebDriverWait(driver, 3).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                    cookie_button.click()
-                    logger.debug("Accepted cookie consent")
-                    time.sleep(1)
+        """Accept cookie consent if present, skipping the check when consent is already stored"""
+        chrome_config = self.config.get('chrome', {})
+        try:
+            for cookie_name in chrome_config.get('consent_cookies', []):
+                if driver.get_cookie(cookie_name):
+                    logger.debug(f"Consent cookie {cookie_name} already set")
                     return
-                except TimeoutException:
-                    continue
             
-            logger.debug("No cookie consent dialog found")
+            # One combined check for all known consent buttons instead of a wait per pattern;
+            # an implicit wait would stall every poll, so it is suspended meanwhile
+            combined_xpath = ' | '.join(CONSENT_BUTTON_XPATHS)
+            implicit_wait = chrome_config.get('implicit_wait', 10)
+            if chrome_config.get('lean', {}).get('enabled', False):
+                implicit_wait = 0
+            if implicit_wait:
+                driver.implicitly_wait(0)
+            try:
+                buttons = WebDriverWait(driver, chrome_config.get('consent_wait', 3)).until(
+                    lambda d: [b for b in d.find_elements(By.XPATH, combined_xpath) if b.is_displayed()]
+                )
+            except TimeoutException:
+                logger.debug("No cookie consent dialog found")
+                return
+            finally:
+                if implicit_wait:
+                    driver.implicitly_wait(implicit_wait)
+            
+            buttons[0].click()
+            logger.debug("Accepted cookie consent")
+            try:
+                WebDriverWait(driver, 2).until(EC.invisibility_of_element(buttons[0]))
+            except TimeoutException:
+                pass
             
         except Exception as e:
             logger.debug(f"Cookie acceptance failed: {str(e)}")
     
+    @stage('login', source='pracuj')
     def _login_pracuj(self, driver):
         """Enhanced login function for pracuj.pl with better error handling"""
         if not self.email or not self.password:
@@ -225,11 +509,768 @@ class JobScraper:
         
         try:
             logger.info("Attempting to log in to pracuj.pl")
-            driver.get("https://login.pracuj.pl/")
+            login_url = self.config.get('sources', {}).get('pracuj', {}).get('login_url', 'https://login.pracuj.pl/')
+            driver.get(login_url)
             
             self._accept_cookies(driver)
+            self._record_page(driver, 'pracuj', 'login')
             
             # Enter email
             email_input = WebDriverWait(driver, 30).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='email']"))
-            )\n            email_input.clear()\n            email_input.send_keys(self.email)\n            \n            # Submit email\n            submit_button = driver.find_element(By.CSS_SELECTOR, "button[type='submit']")\n            submit_button.click()\n            \n            # Enter password\n            password_input = WebDriverWait(driver, 30).until(\n                EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='password']"))\n            )\n            password_input.clear()\n            password_input.send_keys(self.password)\n            \n            # Submit password\n            submit_button = driver.find_element(By.CSS_SELECTOR, "button[type='submit']")\n            submit_button.click()\n            \n            # Wait for login to complete\n            try:\n                WebDriverWait(driver, 10).until(\n                    EC.any_of(\n                        EC.presence_of_element_located((By.XPATH, "//h1[contains(text(), 'Nowe konto już jest')]")),\n                        EC.url_contains("pracuj.pl")\n                    )\n                )\n                logger.info("Successfully logged in to pracuj.pl")\n                return True\n                \n            except TimeoutException:\n                logger.warning("Login verification timeout - proceeding anyway")\n                return True\n                \n        except Exception as e:\n            logger.error(f"Login failed for pracuj.pl: {str(e)}")\n            return False\n    \n    def _parse_pracuj_job(self, job_element):\n        """Parse a single job element from pracuj.pl with enhanced error handling"""\n        try:\n            # Skip if already applied or saved\n            if (job_element.find("button", attrs={"data-test": "add-to-favourites", "data-test-checkboxstate": "true"}) or\n                job_element.find("div", attrs={"data-test": "applied-text"})):\n                return None\n            \n            # Extract job details\n            title_elem = job_element.find("h2", attrs={"data-test": "offer-title"})\n            company_elem = job_element.find("h3", attrs={"data-test": "text-company-name"})\n            location_elem = job_element.find("h4", attrs={"data-test": "text-region"})\n            link_elem = job_element.find("a", attrs={"data-test": "link-offer"})\n            \n            # Extract technologies\n            tech_elements = job_element.find_all("span", attrs={"data-test": "technologies-item"})\n            technologies = [tech.get_text(strip=True) for tech in tech_elements]\n            \n            # Build job object\n            job = {\n                "title": title_elem.get_text(strip=True) if title_elem else "N/A",\n                "company": company_elem.get_text(strip=True) if company_elem else "N/A",\n                "location": location_elem.get_text(strip=True) if location_elem else "N/A",\n                "technologies": technologies,\n                "link": link_elem["href"] if link_elem and "href" in link_elem.attrs else "N/A",\n                "source": "pracuj",\n                "extracted": datetime.now().isoformat(),\n                "id": self._generate_job_id(title_elem.get_text(strip=True) if title_elem else "unknown", \n                                         company_elem.get_text(strip=True) if company_elem else "unknown")\n            }\n            \n            # Calculate relevance score (basic implementation)\n            job["score"] = self._calculate_job_score(job)\n            \n            return job\n            \n        except Exception as e:\n            logger.warning(f"Failed to parse job element: {str(e)}")\n            return None\n    \n    def _generate_job_id(self, title, company):\n        """Generate a unique ID for a job posting"""\n        content = f"{title}_{company}_{datetime.now().strftime('%Y-%m-%d')}"\n        return hashlib.md5(content.encode()).hexdigest()[:12]\n    \n    def _calculate_job_score(self, job):\n        """Calculate a relevance score for a job (0.0 to 1.0)"""\n        score = 0.5  # Base score\n        \n        # Increase score for relevant technologies\n        relevant_techs = ['python', 'django', 'flask', 'fastapi', 'postgresql', 'docker', 'kubernetes']\n        tech_matches = sum(1 for tech in job.get('technologies', []) \n                          if any(rt in tech.lower() for rt in relevant_techs))\n        score += min(tech_matches * 0.1, 0.3)\n        \n        # Increase score for relevant title keywords\n        title_keywords = ['python', 'backend', 'engineer', 'developer', 'senior']\n        title_matches = sum(1 for keyword in title_keywords \n                           if keyword in job.get('title', '').lower())\n        score += min(title_matches * 0.05, 0.2)\n        \n        return min(score, 1.0)\n    \n    def scrape_pracuj(self, keywords="python engineer", max_pages=None):\n        """Scrape jobs from pracuj.pl with enhanced error handling"""\n        jobs = []\n        source = 'pracuj'\n        \n        try:\n            driver = self._get_driver(source)\n            \n            # Login first\n            login_success = self._login_pracuj(driver)\n            if not login_success:\n                logger.warning("Proceeding without login")\n            \n            # Construct search URL\n            encoded_keywords = keywords.replace(' ', '%20')\n            max_pages = max_pages or self.config.get('sources', {}).get('pracuj', {}).get('max_pages', 10)\n            \n            page = 1\n            consecutive_failures = 0\n            \n            while page <= max_pages and consecutive_failures < 3:\n                try:\n                    search_url = f"https://it.pracuj.pl/praca/{encoded_keywords};kw/ostatnich%2024h;p,{page}/polska;ct,1"\n                    logger.info(f"Scraping page {page}: {search_url}")\n                    \n                    self._rate_limited_request(driver, search_url, source)\n                    \n                    # Wait for jobs to load\n                    WebDriverWait(driver, 20).until(\n                        EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-test='default-offer']"))\n                    )\n                    \n                    # Parse page content\n                    soup = BeautifulSoup(driver.page_source, "html.parser")\n                    offers_section = soup.find("div", attrs={"data-test": "section-offers"})\n                    \n                    if not offers_section:\n                        logger.warning(f"No offers section found on page {page}")\n                        consecutive_failures += 1\n                        page += 1\n                        continue\n                    \n                    job_offers = offers_section.find_all("div", attrs={"data-test": "default-offer"})\n                    \n                    if not job_offers:\n                        logger.info(f"No more job offers found on page {page}")\n                        break\n                    \n                    # Parse each job\n                    page_jobs = 0\n                    for job_elem in job_offers:\n                        parsed_job = self._parse_pracuj_job(job_elem)\n                        if parsed_job:\n                            jobs.append(parsed_job)\n                            page_jobs += 1\n                    \n                    logger.info(f"Found {page_jobs} jobs on page {page}")\n                    \n                    if page_jobs == 0:\n                        consecutive_failures += 1\n                    else:\n                        consecutive_failures = 0\n                    \n                    # Check for next page\n                    try:\n                        next_button = driver.find_element(By.CSS_SELECTOR, "button[data-test='bottom-pagination-button-next']")\n                        if not next_button.is_enabled():\n                            logger.info("No more pages available")\n                            break\n                    except NoSuchElementException:\n                        logger.info("Next button not found - last page reached")\n                        break\n                    \n                    page += 1\n                    \n                except TimeoutException:\n                    logger.warning(f"Timeout loading page {page}")\n                    consecutive_failures += 1\n                    page += 1\n                    continue\n                    \n                except Exception as e:\n                    logger.error(f"Error scraping page {page}: {str(e)}")\n                    consecutive_failures += 1\n                    page += 1\n                    continue\n            \n            logger.info(f"Scraping completed. Found {len(jobs)} jobs from {source}")\n            return jobs\n            \n        except Exception as e:\n            logger.error(f"Fatal error in {source} scraping: {str(e)}")\n            raise ScrapingError(f"Scraping failed for {source}: {str(e)}")\n    \n    def scrape_all_sources(self, keywords="python engineer", location="poland", sources=None, max_results=100, fresh_only=True):\n        """Scrape jobs from all enabled sources"""\n        all_jobs = []\n        sources = sources or ['pracuj']\n        \n        logger.info(f"Starting multi-source scraping: {sources}")\n        \n        for source in sources:\n            if not self.config.get('sources', {}).get(source, {}).get('enabled', False):\n                logger.warning(f"Source {source} is not enabled, skipping")\n                continue\n            \n            try:\n                if source == 'pracuj':\n                    jobs = self.scrape_pracuj(keywords)\n                    all_jobs.extend(jobs)\n                else:\n                    logger.warning(f"Source {source} not implemented yet")\n                    \n            except Exception as e:\n                logger.error(f"Failed to scrape from {source}: {str(e)}")\n                continue\n        \n        # Remove duplicates and apply filters\n        filtered_jobs = self._filter_and_deduplicate(all_jobs, max_results)\n        \n        logger.info(f"Multi-source scraping completed. Total jobs: {len(filtered_jobs)}")\n        return filtered_jobs\n    \n    def _filter_and_deduplicate(self, jobs, max_results):\n        """Filter and remove duplicate jobs"""\n        # Remove duplicates based on title and company\n        seen = set()\n        unique_jobs = []\n        \n        for job in jobs:\n            job_key = f"{job.get('title', '')}__{job.get('company', '')}".lower()\n            if job_key not in seen:\n                seen.add(job_key)\n                unique_jobs.append(job)\n        \n        # Sort by score (highest first)\n        unique_jobs.sort(key=lambda x: x.get('score', 0), reverse=True)\n        \n        # Apply max_results limit\n        if len(unique_jobs) > max_results:\n            unique_jobs = unique_jobs[:max_results]\n        \n        logger.info(f"Filtered {len(jobs)} jobs down to {len(unique_jobs)} unique jobs")\n        return unique_jobs\n    \n    def cleanup(self):\n        """Cleanup resources"""\n        self._close_drivers()\n        logger.info("JobScraper cleanup completed")\n    \n    def __del__(self):\n        """Destructor to ensure cleanup"""\n        try:\n            self.cleanup()\n        except:\n            pass\n\n# Backward compatibility function\ndef scrape_jobs():\n    """Backward compatibility function for existing API"""\n    scraper = None\n    try:\n        scraper = JobScraper()\n        jobs = scraper.scrape_pracuj()\n        return jobs\n    except Exception as e:\n        logger.error(f"Legacy scrape_jobs function failed: {str(e)}")\n        # Return mock data for testing\n        return [{\n            "title": "Python Developer (Mock)",\n            "company": "Test Company",\n            "location": "Warsaw, Poland",\n            "technologies": ["Python", "Django"],\n            "link": "https://example.com",\n            "source": "pracuj",\n            "score": 0.8,\n            "extracted": datetime.now().isoformat()\n        }]\n    finally:\n        if scraper:\n            scraper.cleanup()\n\nif __name__ == "__main__":\n    # Test the scraper\n    scraper = JobScraper()\n    try:\n        jobs = scraper.scrape_pracuj("python engineer")\n        logger.info(f"Test scraping completed. Found {len(jobs)} jobs")\n        \n        # Save results for testing\n        os.makedirs("output", exist_ok=True)\n        with open("output/test_results.json", "w", encoding="utf-8") as f:\n            json.dump(jobs, f, ensure_ascii=False, indent=2)\n        \n    except Exception as e:\n        logger.error(f"Test scraping failed: {str(e)}")\n    finally:\n        scraper.cleanup()
+            )
+            email_input.clear()
+            email_input.send_keys(self.email)
+            
+            # Submit email
+            submit_button = WebDriverWait(driver, 10).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, "button[type='submit']"))
+            )
+            submit_button.click()
+            
+            # Enter password
+            password_input = WebDriverWait(driver, 30).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='password']"))
+            )
+            self._record_page(driver, 'pracuj', 'login-password')
+            password_input.clear()
+            password_input.send_keys(self.password)
+            
+            # Submit password
+            submit_button = WebDriverWait(driver, 10).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, "button[type='submit']"))
+            )
+            submit_button.click()
+            
+            # Wait for login to complete
+            try:
+                WebDriverWait(driver, 10).until(
+                    EC.any_of(
+                        EC.presence_of_element_located((By.XPATH, "//h1[contains(text(), 'Nowe konto już jest')]")),
+                        EC.url_contains("pracuj.pl")
+                    )
+                )
+                logger.info("Successfully logged in to pracuj.pl")
+                self._record_page(driver, 'pracuj', 'login-done')
+                return True
+                
+            except TimeoutException:
+                logger.warning("Login verification timeout - proceeding anyway")
+                return True
+                
+        except Exception as e:
+            logger.error(f"Login failed for pracuj.pl: {str(e)}")
+            return False
+    
+    def _restore_session(self, driver, base_url, cookies):
+        """Load saved session cookies into a driver, returning True if any were accepted"""
+        try:
+            driver.get(base_url)
+        except Exception as e:
+            logger.debug(f"Could not open {base_url} to restore session: {str(e)}")
+            return False
+        
+        restored = 0
+        for cookie in cookies:
+            try:
+                driver.add_cookie(cookie)
+                restored += 1
+            except Exception:
+                # Cookies scoped to another subdomain cannot be set from here
+                continue
+        
+        logger.debug(f"Restored {restored}/{len(cookies)} session cookies")
+        return restored > 0
+    
+    def _ensure_pracuj_session(self, driver, source='pracuj'):
+        """Reuse a live or saved pracuj.pl login, logging in only when it has expired"""
+        lease = self._leases.get(source)
+        base_url = self.config.get('sources', {}).get('pracuj', {}).get('base_url', 'https://it.pracuj.pl')
+        if lease and 'pracuj' in lease.sessions:
+            # A login confirmed recently is trusted; an older one is checked on the site
+            if lease.session_age('pracuj') <= self.driver_pool.session_check_interval:
+                logger.debug("Reusing logged-in pooled WebDriver for pracuj.pl")
+                return True
+            if self._session_active(source, self._reload_page(driver, base_url)):
+                logger.debug("Pooled WebDriver is still logged in to pracuj.pl")
+                lease.mark_session('pracuj')
+                return True
+            logger.info("Pooled WebDriver's pracuj.pl session was ended by the site")
+            lease.drop_session('pracuj')
+            self._clear_cookies(driver)
+        
+        sessions = self.driver_pool.sessions if self.driver_pool else None
+        
+        if sessions:
+            cookies = sessions.load('pracuj')
+            if cookies and self._restore_session(driver, base_url, cookies):
+                if self._session_active(source, self._reload_page(driver, base_url)):
+                    logger.info("Restored saved pracuj.pl session")
+                    if lease:
+                        lease.mark_session('pracuj')
+                    return True
+                self._expire_session(sessions)
+                self._clear_cookies(driver)
+        
+        logged_in = self._login_pracuj(driver)
+        if logged_in:
+            if sessions:
+                try:
+                    sessions.save('pracuj', driver.get_cookies())
+                except Exception as e:
+                    logger.warning(f"Could not read session cookies: {str(e)}")
+            if lease:
+                lease.mark_session('pracuj')
+        
+        return logged_in
+    
+    def _share_pracuj_session(self, fetcher, source='pracuj'):
+        """Log in once (or reuse a saved session) and share its cookies with the HTTP client"""
+        http = getattr(fetcher, 'primary', None)
+        if not isinstance(http, HttpFetcher):
+            return self._ensure_pracuj_session(self._get_driver(source), source)
+        
+        if not self.email or not self.password:
+            logger.warning("No credentials provided for pracuj.pl login")
+            return False
+        
+        sessions = self.driver_pool.sessions if self.driver_pool else None
+        cookies = sessions.load('pracuj') if sessions else None
+        if cookies:
+            http.load_cookies(cookies)
+            if self._http_session_active(source, http):
+                return True
+            self._expire_session(sessions)
+            http.session.cookies.clear()
+        
+        driver = self._get_driver(source)
+        lease = self._leases.get(source)
+        if cookies and lease:
+            # A pooled browser may still hold the session the site has just ended
+            lease.drop_session('pracuj')
+        if not self._ensure_pracuj_session(driver, source):
+            return False
+        cookies = driver.get_cookies()
+        # The browser is only needed again if a page falls back to it
+        self._release_driver(source)
+        
+        http.load_cookies(cookies)
+        return True
+    
+    def _session_active(self, source, html):
+        """Check a page loaded with restored cookies for signs the site has ended the session"""
+        if html is None:
+            # Nothing to check against; the restored cookies are used as they are
+            return True
+        return not self._get_parser(source).shows_logged_out(html)
+    
+    def _reload_page(self, driver, url):
+        """Load a page in the browser and return its HTML, or None if it could not be loaded"""
+        try:
+            driver.get(url)
+            return driver.page_source
+        except Exception as e:
+            logger.debug(f"Could not load {url} to check the session: {str(e)}")
+            return None
+    
+    def _http_session_active(self, source, http):
+        """Check over HTTP that cookies loaded into the client still give a logged-in session"""
+        self._throttle(source)
+        try:
+            html = http.fetch('/').html
+        except Exception as e:
+            logger.debug(f"Could not load the start page to check the session: {str(e)}")
+            html = None
+        return self._session_active(source, html)
+    
+    def _clear_cookies(self, driver):
+        """Remove the cookies of a session the site has ended from a browser"""
+        try:
+            driver.delete_all_cookies()
+        except Exception as e:
+            logger.debug(f"Could not clear expired session cookies: {str(e)}")
+    
+    def _expire_session(self, sessions, site='pracuj'):
+        """Forget a saved session the site no longer accepts so the next checkout logs in"""
+        logger.info(f"Saved {site} session was ended by the site - logging in again")
+        sessions.invalidate(site)
+    
+    def _build_job(self, offer, source):
+        """Turn raw fields extracted by the parser into a normalized job object"""
+        job = {
+            "title": offer.get('title') or "N/A",
+            "company": offer.get('company') or "N/A",
+            "location": offer.get('location') or "N/A",
+            "technologies": offer.get('technologies', []),
+            "link": offer.get('link') or "N/A",
+            "source": source,
+            "extracted": datetime.now().isoformat(),
+            "id": self._generate_job_id(offer.get('title') or "unknown", offer.get('company') or "unknown",
+                                        offer.get('link'), source)
+        }
+        
+        return job
+    
+    def _generate_job_id(self, title, company, link=None, source=None):
+        """Generate an ID that stays the same for an offer across runs and days
+        
+        The offer link's path identifies an offer (its query string only carries search
+        tracking parameters); title and company are used when there is no link.
+        """
+        path = urlsplit(link).path if link else ''
+        content = f"{source}_{path}" if path else f"{title}_{company}"
+        return hashlib.md5(content.encode()).hexdigest()[:12]
+    
+    def _span(self, stage_name, source='all'):
+        """Time a block as a scrape stage in the shared metrics and this run's timings"""
+        return span(stage_name, source, self.timings)
+    
+    def _report_progress(self, pages=0, jobs=0):
+        """Accumulate scrape progress and pass it to the progress callback, if any"""
+        self.pages_done += pages
+        self.jobs_found += jobs
+        if self.progress_callback:
+            try:
+                self.progress_callback(self.pages_done, self.jobs_found)
+            except Exception as e:
+                logger.debug(f"Progress callback failed: {str(e)}")
+    
+    def _get_source(self, source):
+        """Get the plugin for a source, raising ScrapingError if there is none"""
+        plugin = get_source(source, self.config.get('sources', {}).get(source, {}))
+        if plugin is None:
+            raise ScrapingError(f"Source {source} not implemented yet")
+        return plugin
+    
+    def _get_parser(self, source):
+        """Get the compiled selector parser for a source"""
+        return self._get_source(source).parser()
+    
+    def _parse_page(self, source, html, page):
+        """Parse one listing page into (jobs, status).
+        
+        Status is 'missing' when the offers section is absent, 'empty' when it holds no
+        offers, 'last' when the source's pagination rule ends and 'more' otherwise.
+        """
+        plugin = self._get_source(source)
+        with self._span('parse', source):
+            parsed = plugin.parser().parse(html)
+        
+        if not parsed.section_found:
+            logger.warning(f"No offers section found on page {page}")
+            return [], 'missing'
+        
+        if not parsed.offers and not parsed.skipped:
+            logger.info(f"No more job offers found on page {page}")
+            return [], 'empty'
+        
+        jobs = [self._build_job(offer, source) for offer in parsed.offers]
+        with self._span('score', source):
+            for job, score in zip(jobs, self.scoring.score_batch(jobs)):
+                job["score"] = round(float(score), 4)
+        JOBS_PARSED.inc(len(jobs), source=source)
+        logger.info(f"Found {len(jobs)} jobs on page {page}")
+        
+        if not plugin.has_next_page(parsed, page):
+            logger.info("No next page available - last page reached")
+            return jobs, 'last'
+        
+        return jobs, 'more'
+    
+    def scrape_pracuj(self, keywords="python engineer", max_pages=None, incremental=None):
+        """Scrape jobs from pracuj.pl with enhanced error handling"""
+        return list(self.iter_pracuj(keywords, max_pages=max_pages, incremental=incremental))
+    
+    def iter_pracuj(self, keywords="python engineer", max_pages=None, incremental=None):
+        """Yield jobs from pracuj.pl page by page as each page is parsed"""
+        return self.iter_source('pracuj', keywords, max_pages=max_pages, incremental=incremental)
+    
+    def iter_source(self, source, keywords="python engineer", max_pages=None, incremental=None, resume=True):
+        """Yield jobs from one source page by page as each page is parsed
+        
+        Progress is checkpointed in the job store after every page. A run that fails is
+        resumed from the page after its last checkpoint up to `search.resume_attempts`
+        times; if it still fails, the jobs found so far are kept along with the checkpoint
+        and `partial` is set.
+        A later run of the same search within `search.checkpoint_max_age` seconds continues
+        such a failed run, or one that crashed (no checkpoint for
+        `search.checkpoint_live_timeout` seconds), unless `resume` is False. A run that
+        completes or is closed by its consumer drops its checkpoint, and while a run is
+        live, concurrent runs of the same search neither resume nor checkpoint it.
+        """
+        plugin = self._get_source(source)
+        max_pages = max_pages or plugin.max_pages
+        search_config = self.config.get('search', {})
+        key = self._checkpoint_key(source, keywords, max_pages)
+        owner = uuid.uuid4().hex
+        params = {'source': source, 'keywords': keywords, 'max_pages': max_pages}
+        
+        claimed, checkpoint = self._claim_checkpoint(key, owner, params, resume)
+        keep_checkpoint = False
+        try:
+            start_page, job_ids = 1, []
+            if checkpoint:
+                start_page, job_ids = checkpoint['page'] + 1, checkpoint['job_ids']
+                SEARCH_RESUMES.inc(source=source)
+                logger.info(f"Resuming {source} search {keywords!r} after page {checkpoint['page']} "
+                            f"with {len(job_ids)} jobs already found")
+                resumed_jobs = self.job_store.get_jobs_by_ids(job_ids)
+                self._report_progress(jobs=len(resumed_jobs))
+                yield from resumed_jobs
+            
+            attempts = max(0, int(search_config.get('resume_attempts', 2)))
+            for attempt in range(attempts + 1):
+                try:
+                    for page, page_jobs in self._iter_pages(source, plugin, keywords, start_page, max_pages, incremental):
+                        job_ids.extend(job['id'] for job in page_jobs)
+                        start_page = page + 1
+                        if claimed:
+                            self._save_checkpoint(key, owner, page, job_ids)
+                        yield from page_jobs
+                    return
+                    
+                except ScrapingError as e:
+                    if attempt < attempts:
+                        SEARCH_RESUMES.inc(source=source)
+                        logger.warning(f"{str(e)} - resuming from page {start_page} (attempt {attempt + 2}/{attempts + 1})")
+                        continue
+                    if not job_ids:
+                        raise
+                    logger.warning(f"{str(e)} - keeping {len(job_ids)} jobs found before the failure")
+                    self.partial = True
+                    keep_checkpoint = True
+        finally:
+            # Only a failed run leaves its checkpoint behind; one that completed or was closed
+            # early (max_results reached, client gone, task cancelled) has nothing to resume
+            if claimed:
+                self._release_checkpoint(key, owner, keep_checkpoint)
+    
+    def _iter_pages(self, source, plugin, keywords, start_page, max_pages, incremental=None):
+        """Yield (page, jobs) for each listing page parsed, from start_page to max_pages
+        
+        In incremental mode pagination stops at the first page whose offers are all
+        already in the job store. A browser that stops responding is replaced and its
+        page fetched again.
+        """
+        jobs_count = 0
+        if incremental is None:
+            incremental = self.config.get('database', {}).get('incremental', False)
+        if incremental and not self.job_store:
+            logger.warning("Incremental mode requested without a job store - scraping all pages")
+            incremental = False
+        
+        try:
+            source_config = self.config.get('sources', {}).get(source, {})
+            fetcher = self._get_fetcher(source)
+            
+            # Login first (reuses a pooled or saved session when still valid)
+            with self._span('prepare', source):
+                login_success = plugin.prepare(self, fetcher)
+            if login_success:
+                self.logged_in.add(source)
+            else:
+                logger.warning("Proceeding without login")
+            
+            concurrency = max(1, int(source_config.get('concurrency', 3)))
+            ready_selector = plugin.selectors.get('job_offer')
+            max_restarts = self.config.get('chrome', {}).get('max_driver_restarts', 2)
+            
+            page = start_page
+            next_page = start_page
+            consecutive_failures = 0
+            loaded_pages = failed_pages = 0
+            restarts = 0
+            pending = {}
+            executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"{source}-fetch")
+            
+            try:
+                while page <= max_pages:
+                    if consecutive_failures >= 3:
+                        raise ScrapingError(f"Giving up on {source} after {consecutive_failures} failed pages in a row")
+                    
+                    # Keep up to `concurrency` pages in flight ahead of the one being parsed
+                    while next_page <= max_pages and len(pending) < concurrency:
+                        search_url = plugin.search_url(keywords, next_page)
+                        logger.info(f"Scraping page {next_page}: {search_url}")
+                        pending[next_page] = executor.submit(self._fetch_page, source, search_url, ready_selector)
+                        next_page += 1
+                    
+                    future = pending.pop(page)
+                    try:
+                        result = future.result()
+                        loaded_pages += 1
+                        page_jobs, status = self._parse_page(source, result.html, page)
+                        self._report_progress(pages=1, jobs=len(page_jobs))
+                        
+                        new_ids = None
+                        if self.job_store and page_jobs:
+                            with self._span('store', source):
+                                new_ids = self.job_store.save_jobs(page_jobs)
+                        
+                        jobs_count += len(page_jobs)
+                        yield page, page_jobs
+                        
+                        if incremental and page_jobs and not new_ids:
+                            logger.info(f"All offers on page {page} were already seen - stopping incremental scrape")
+                            break
+                        
+                        if status == 'missing':
+                            PAGE_FAILURES.inc(source=source, reason='missing')
+                            consecutive_failures += 1
+                            page += 1
+                            continue
+                        if status == 'empty':
+                            break
+                        
+                        if page_jobs:
+                            consecutive_failures = 0
+                        else:
+                            consecutive_failures += 1
+                        
+                        if status == 'last':
+                            break
+                        
+                        page += 1
+                        
+                    except Exception as e:
+                        # A crashed browser is replaced and every page still in flight fetched again
+                        if restarts < max_restarts and self._replace_dead_driver(source):
+                            restarts += 1
+                            for queued in pending.values():
+                                queued.cancel()
+                            pending.clear()
+                            next_page = page
+                            self._restore_source_session(plugin, fetcher)
+                            continue
+                        
+                        if isinstance(e, TimeoutException):
+                            logger.warning(f"Timeout loading page {page}")
+                            PAGE_FAILURES.inc(source=source, reason='timeout')
+                        else:
+                            logger.error(f"Error scraping page {page}: {str(e)}")
+                            PAGE_FAILURES.inc(source=source, reason='error')
+                        failed_pages += 1
+                        consecutive_failures += 1
+                        page += 1
+                        continue
+            finally:
+                # Pages queued past the last one are dropped without being fetched; fetches
+                # already running are waited for so none can lease a driver after cleanup()
+                executor.shutdown(wait=True, cancel_futures=True)
+            
+            if failed_pages and not loaded_pages:
+                raise ScrapingError(f"None of the {failed_pages} {source} pages could be loaded")
+            
+            logger.info(f"Scraping completed. Found {jobs_count} jobs from {source}")
+            
+        except ScrapingError:
+            raise
+        except Exception as e:
+            logger.error(f"Fatal error in {source} scraping: {str(e)}")
+            raise ScrapingError(f"Scraping failed for {source}: {str(e)}")
+    
+    def _replace_dead_driver(self, source):
+        """Discard the source's WebDriver if it no longer responds; True if one was discarded
+        
+        The next browser fetch starts (or leases) a fresh driver.
+        """
+        driver = self.drivers.get(source)
+        if driver is None:
+            return False
+        try:
+            driver.execute_script('return 1')
+            return False
+        except Exception as e:
+            logger.warning(f"WebDriver for {source} stopped responding ({str(e)}) - replacing it")
+        
+        DRIVER_RESTARTS.inc(source=source)
+        self.drivers.pop(source, None)
+        lease = self._leases.pop(source, None)
+        if lease:
+            self.driver_pool.discard(lease)
+        else:
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.debug(f"Error quitting dead WebDriver: {str(e)}")
+        return True
+    
+    def _restore_source_session(self, plugin, fetcher):
+        """Log a replacement browser back in, from the saved session when possible"""
+        try:
+            with self._span('prepare', plugin.name):
+                plugin.prepare(self, fetcher)
+        except Exception as e:
+            logger.warning(f"Could not restore {plugin.name} session after driver restart: {str(e)}")
+    
+    def _checkpoint_key(self, source, keywords, max_pages):
+        """Identify a search so a later run of the same search can resume it"""
+        return f"{source}:{' '.join(keywords.lower().split())}:{max_pages}"
+    
+    def _claim_checkpoint(self, key, owner, params, resume=True):
+        """Claim a search's checkpoint for this run; returns (claimed, checkpoint to resume or None)
+        
+        Nothing is claimed without a job store or while another run of the search is live.
+        """
+        if not self.job_store:
+            return False, None
+        search_config = self.config.get('search', {})
+        try:
+            claimed, checkpoint = self.job_store.claim_checkpoint(
+                key, owner, params,
+                max_age=search_config.get('checkpoint_max_age', 3600),
+                live_timeout=search_config.get('checkpoint_live_timeout', 300),
+                resume=resume
+            )
+        except Exception as e:
+            logger.warning(f"Could not claim checkpoint {key}: {str(e)}")
+            return False, None
+        if not claimed:
+            logger.info(f"Search {key} is already running elsewhere - scraping it without a checkpoint")
+        return claimed, checkpoint
+    
+    def _save_checkpoint(self, key, owner, page, job_ids):
+        try:
+            self.job_store.save_checkpoint(key, owner, page, job_ids)
+        except Exception as e:
+            logger.warning(f"Could not save checkpoint {key}: {str(e)}")
+    
+    def _release_checkpoint(self, key, owner, keep=False):
+        try:
+            self.job_store.release_checkpoint(key, owner, keep)
+        except Exception as e:
+            logger.warning(f"Could not release checkpoint {key}: {str(e)}")
+    
+    def scrape_all_sources(self, keywords=None, location="poland", sources=None, max_results=100, fresh_only=True, incremental=None,
+                           resume=True):
+        """Scrape jobs from all enabled sources for one or more keyword queries
+        
+        `location` and `fresh_only` are accepted for compatibility only: each source's
+        `search_path` fixes both (pracuj.pl searches Poland, last 24 hours).
+        """
+        all_jobs = list(self.iter_all_sources(keywords, sources=sources, incremental=incremental,
+                                              stream_dedup=False, resume=resume))
+        
+        # Remove duplicates and apply filters
+        filtered_jobs = self._mark_reposts(self._filter_and_deduplicate(all_jobs, max_results))
+        
+        logger.info(f"Multi-source scraping completed. Total jobs: {len(filtered_jobs)}")
+        return filtered_jobs
+    
+    def _plan_tasks(self, keywords, sources):
+        """Build one (source, keywords) task per enabled, implemented source and query"""
+        if not keywords:
+            keywords = self.config.get('search', {}).get('default_keywords', ['python engineer'])
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        
+        runnable = []
+        for source in sources or ['pracuj']:
+            if not self.config.get('sources', {}).get(source, {}).get('enabled', False):
+                logger.warning(f"Source {source} is not enabled, skipping")
+            elif get_source(source, self.config['sources'][source]) is None:
+                logger.warning(f"Source {source} not implemented yet (plugins: {', '.join(registered_sources())}; "
+                               f"other sources need search_path and selectors)")
+            else:
+                runnable.append(source)
+        
+        return plan_tasks(runnable, keywords)
+    
+    def _spawn_worker(self, progress_callback=None):
+        """Create a scraper for one orchestrated task, sharing this scraper's pool and store"""
+        worker = JobScraper(self.config, driver_pool=self.driver_pool, job_store=self.job_store,
+                            progress_callback=progress_callback, timings=self.timings)
+        worker.email = self.email
+        worker.password = self.password
+        return worker
+    
+    def iter_all_sources(self, keywords=None, sources=None, incremental=None, stream_dedup=True, resume=True):
+        """Yield unique jobs from all enabled sources as soon as each page is parsed
+        
+        Every (source, keywords) pair runs as a parallel task; without keywords the
+        `search.default_keywords` queries are used. With stream_dedup, near-duplicates are
+        dropped on the fly; since later, higher-scoring copies cannot be waited for, the
+        first copy seen is kept. With resume=False no search continues an earlier run's
+        checkpoint. Raises ScrapingError when every task failed, so an outage
+        is not mistaken for a search without results; when only some failed or a search
+        kept partial results, `partial` is set once the stream is exhausted.
+        """
+        tasks = self._plan_tasks(keywords, sources)
+        seen = set()
+        near_duplicates = NearDuplicateIndex(self._dedup_threshold()) if stream_dedup else None
+        
+        logger.info(f"Starting multi-source scraping: {tasks}")
+        
+        orchestrator = ScrapeOrchestrator(
+            self._spawn_worker,
+            max_workers=self.config.get('search', {}).get('parallel_tasks', 4),
+            progress_callback=self.progress_callback
+        )
+        jobs = orchestrator.iter_jobs(tasks, incremental=incremental, resume=resume)
+        
+        try:
+            for job in jobs:
+                self.parsed_ids.add(job['id'])
+                job_key = self._job_key(job)
+                if job_key in seen:
+                    JOBS_DROPPED.inc(reason='duplicate')
+                    continue
+                seen.add(job_key)
+                
+                if stream_dedup and not self.scoring.apply([job]):
+                    JOBS_DROPPED.inc(reason='filtered')
+                    continue
+                
+                if near_duplicates is not None:
+                    signature = near_duplicates.signature(job)
+                    if near_duplicates.find(signature):
+                        JOBS_DROPPED.inc(reason='near_duplicate')
+                        continue
+                    near_duplicates.add(job_key, signature)
+                yield job
+        finally:
+            jobs.close()
+        
+        if tasks and len(orchestrator.failures) == len(tasks):
+            raise ScrapingError(f"All {len(tasks)} scrape tasks failed: {str(orchestrator.failures[0][1])}")
+        if orchestrator.failures or orchestrator.partial:
+            self.partial = True
+            logger.warning(f"Results are incomplete: {len(orchestrator.failures)} tasks failed, "
+                           f"{len(orchestrator.partial)} stopped early")
+    
+    def _job_key(self, job):
+        """Key used to detect exact duplicate postings"""
+        return f"{job.get('title', '')}__{job.get('company', '')}".lower()
+    
+    def _dedup_threshold(self):
+        """Similarity above which two postings are treated as the same offer"""
+        return self.config.get('search', {}).get('deduplication_threshold', 0.8)
+    
+    @stage('reposts')
+    def _mark_reposts(self, jobs):
+        """Flag jobs that closely match a different offer stored by an earlier run
+        
+        Offers parsed by this run are never matched, so an offer kept by deduplication is
+        not flagged as a repost of the copies dropped next to it.
+        """
+        if not self.job_store or not jobs:
+            return jobs
+        
+        window = self.config.get('search', {}).get('dedup_window_hours', 72)
+        index = get_repost_index(self.job_store, self._dedup_threshold(), window)
+        reposts = index.find_reposts(self.job_store, jobs, exclude=self.parsed_ids)
+        for job in jobs:
+            if job['id'] in reposts:
+                job['duplicate_of'] = reposts[job['id']]
+        
+        logger.info(f"Marked {len(reposts)} jobs as reposts of previously stored offers")
+        return jobs
+    
+    def _filter_and_deduplicate(self, jobs, max_results):
+        """Filter and remove duplicate jobs"""
+        # Remove duplicates based on title and company
+        seen = set()
+        unique_jobs = []
+        
+        for job in jobs:
+            job_key = self._job_key(job)
+            if job_key not in seen:
+                seen.add(job_key)
+                unique_jobs.append(job)
+        
+        JOBS_DROPPED.inc(len(jobs) - len(unique_jobs), reason='duplicate')
+        
+        # Rescore with the configured weights and drop jobs failing processing.filters
+        with self._span('score'):
+            scored_jobs = self.scoring.apply(unique_jobs)
+        JOBS_DROPPED.inc(len(unique_jobs) - len(scored_jobs), reason='filtered')
+        
+        # Drop reworded copies, keeping the highest-scoring one (sorted highest first)
+        with self._span('dedup'):
+            unique_jobs = deduplicate(scored_jobs, self._dedup_threshold())
+        JOBS_DROPPED.inc(len(scored_jobs) - len(unique_jobs), reason='near_duplicate')
+        
+        # Apply max_results limit
+        if max_results and len(unique_jobs) > max_results:
+            unique_jobs = unique_jobs[:max_results]
+        
+        logger.info(f"Filtered {len(jobs)} jobs down to {len(unique_jobs)} unique jobs")
+        return unique_jobs
+    
+    def cleanup(self):
+        """Cleanup resources"""
+        for fetcher in self.fetchers.values():
+            fetcher.close()
+        self.fetchers.clear()
+        self._close_drivers()
+        logger.info("JobScraper cleanup completed")
+    
+    def __del__(self):
+        """Destructor to ensure cleanup"""
+        try:
+            self.cleanup()
+        except:
+            pass
+
+def warm_driver_pool(config=None):
+    """Start the shared WebDriver pool so the first /jobs call skips Chrome startup"""
+    scraper = JobScraper(config)
+    pool = get_driver_pool(scraper.config)
+    return pool.warm(scraper._create_driver)
+
+# Backward compatibility function
+def scrape_jobs(keywords=None, sources=None, incremental=False, progress=None, timings=None, resume=True, outcome=None):
+    """Backward compatibility function for existing API
+    
+    If an `outcome` dict is given, its `partial` key reports whether some searches failed
+    or stopped early, so the jobs returned are incomplete.
+    """
+    scraper = None
+    try:
+        scraper = JobScraper(progress_callback=progress, timings=timings)
+        scraper.driver_pool = get_driver_pool(scraper.config)
+        scraper.job_store = get_job_store(scraper.config)
+        jobs = scraper.scrape_all_sources(
+            keywords,
+            sources=sources,
+            max_results=None,
+            incremental=incremental,
+            resume=resume
+        )
+        if outcome is not None:
+            outcome['partial'] = scraper.partial
+        return jobs
+    except Exception as e:
+        # Raised rather than answered with placeholder jobs, so failures are never cached
+        logger.error(f"Legacy scrape_jobs function failed: {str(e)}")
+        raise
+    finally:
+        if scraper:
+            scraper.cleanup()
+
+def iter_jobs(keywords=None, sources=None, incremental=False, progress=None, resume=True):
+    """Yield unique jobs as they are scraped, releasing the scraper when exhausted or closed"""
+    scraper = JobScraper(progress_callback=progress)
+    scraper.driver_pool = get_driver_pool(scraper.config)
+    scraper.job_store = get_job_store(scraper.config)
+    try:
+        yield from scraper.iter_all_sources(keywords, sources=sources, incremental=incremental, resume=resume)
+    finally:
+        scraper.cleanup()
+
+if __name__ == "__main__":
+    # Test the scraper
+    scraper = JobScraper()
+    try:
+        jobs = scraper.scrape_pracuj("python engineer")
+        logger.info(f"Test scraping completed. Found {len(jobs)} jobs")
+        
+        # Save results for testing
+        os.makedirs("output", exist_ok=True)
+        with open("output/test_results.json", "w", encoding="utf-8") as f:
+            json.dump(jobs, f, ensure_ascii=False, indent=2)
+        
+    except Exception as e:
+        logger.error(f"Test scraping failed: {str(e)}")
+    finally:
+        scraper.cleanup()
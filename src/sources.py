@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Job Source Plugins
+
+Every job source is described by a plugin that knows how to build its search URLs, which
+selectors parse its listing pages and when its pagination ends. Sources register by name;
+a source configured with only `search_path` and `selectors` uses the generic plugin.
+"""
+
+from loguru import logger
+import threading
+from parser_engine import get_parser
+
+
+class SourcePlugin:
+    """Generic source driven entirely by its `sources.<name>` config block"""
+
+    default_search_path = None
+    default_selectors = {}
+
+    def __init__(self, name, source_config=None):
+        self.name = name
+        self.config = source_config or {}
+
+    @property
+    def max_pages(self):
+        return self.config.get('max_pages', 10)
+
+    @property
+    def selectors(self):
+        """Default selectors overridden by `sources.<name>.selectors`"""
+        selectors = dict(self.default_selectors)
+        selectors.update(self.config.get('selectors', {}))
+        return selectors
+
+    def encode_keywords(self, keywords):
+        return keywords.replace(' ', '%20')
+
+    def search_url(self, keywords, page):
+        """Search URL (relative to base_url) of one listing page"""
+        search_path = self.config.get('search_path', self.default_search_path)
+        return search_path.format(keywords=self.encode_keywords(keywords), page=page)
+
+    def parser(self):
+        """Compiled selector parser for this source's listing pages"""
+        return get_parser(self.name, self.selectors, self.config.get('parser', 'auto'))
+
+    def has_next_page(self, parsed, page):
+        """Pagination rule: keep going while an enabled next-page control is present"""
+        return parsed.has_next
+
+    def prepare(self, scraper, fetcher):
+        """Run once per search before the first page, e.g. to log in; False means anonymous"""
+        return True
+
+    def prepare_browser(self, scraper, driver):
+        """Bring a browser acquired after prepare() (e.g. for a fallback fetch) into the same state"""
+        return True
+
+
+_registry = {}
+
+
+def register_source(name):
+    """Class decorator registering a SourcePlugin subclass under a source name"""
+    def decorator(cls):
+        _registry[name] = cls
+        return cls
+    return decorator
+
+
+def registered_sources():
+    """Names of the sources with a registered plugin"""
+    return sorted(_registry)
+
+
+def get_source(name, source_config=None):
+    """Return the plugin for a source, or None if it is neither registered nor configurable"""
+    source_config = source_config or {}
+    plugin_class = _registry.get(name)
+    if plugin_class is None:
+        if not (source_config.get('search_path') and source_config.get('selectors')):
+            return None
+        logger.debug(f"Using generic selector plugin for source: {name}")
+        plugin_class = SourcePlugin
+    return plugin_class(name, source_config)
+
+
+@register_source('pracuj')
+class PracujSource(SourcePlugin):
+    """it.pracuj.pl listings, optionally logged in to hide applied and saved offers"""
+
+    default_search_path = '/praca/{keywords};kw/ostatnich%2024h;p,{page}/polska;ct,1'
+    default_selectors = {
+        'offers_section': "div[data-test='section-offers']",
+        'job_offer': "div[data-test='default-offer']",
+        'title': "h2[data-test='offer-title']",
+        'company': "h3[data-test='text-company-name']",
+        'location': "h4[data-test='text-region']",
+        'technologies': "span[data-test='technologies-item']",
+        'link': "a[data-test='link-offer']",
+        'applied': "div[data-test='applied-text']",
+        'saved': "button[data-test='add-to-favourites'][data-test-checkboxstate='true']",
+        'next_page': "button[data-test='bottom-pagination-button-next']",
+        # Sign-in link shown only to anonymous visitors; used to check restored sessions
+        'logged_out': "a[href*='login.pracuj.pl']:not([href*='logout'])"
+    }
+
+    # Parallel searches wait for a single login and then reuse its saved session
+    _login_lock = threading.Lock()
+
+    def prepare(self, scraper, fetcher):
+        with self._login_lock:
+            return scraper._share_pracuj_session(fetcher, self.name)
+
+    def prepare_browser(self, scraper, driver):
+        with self._login_lock:
+            return scraper._ensure_pracuj_session(driver, self.name)
@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+WSGI Entry Point
+
+Used by production servers, e.g. `gunicorn --workers 1 --threads 8 wsgi:application`.
+Run a single worker process: the driver pool, result cache and scrape queue live in memory.
+"""
+
+from app import app, start_background_services
+
+start_background_services()
+
+application = app